@@ -1,13 +1,14 @@
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import sent_tokenize, word_tokenize
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import networkx as nx
-import numpy as np
+# nltk, scikit-learn, scipy, numpy and langdetect are imported inside the
+# functions that use them, so importing this module (for a CLI --help, a
+# serverless cold start, ...) stays cheap until a text is actually summarized.
+import random
 import re
-from langdetect import detect
-from langdetect.lang_detect_exception import LangDetectException
+import time
+from contextlib import nullcontext
+from functools import lru_cache, partial
+from itertools import islice
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 # Language mappings for supported languages
 LANGUAGE_MAPPINGS = {
@@ -25,6 +26,9 @@ LANGUAGE_MAPPINGS = {
 
 # Download necessary NLTK data
 def download_nltk_data():
+    import nltk
+    from nltk.corpus import stopwords
+    from nltk.tokenize import sent_tokenize
     try:
         stopwords.words('english')
     except LookupError:
@@ -41,151 +45,1071 @@ def download_nltk_data():
         except:
             nltk.download('punkt')
 
-def detect_language(text):
-    """Detect the language of the input text"""
+_nltk_data_checked = False
+
+def _ensure_nltk_data():
+    """
+    Checks for the NLTK data once per process, on first use.
+
+    Nothing is checked or downloaded at import time; missing data is only
+    downloaded when the first text is actually processed.
+    """
+    global _nltk_data_checked
+    if not _nltk_data_checked:
+        download_nltk_data()
+        _nltk_data_checked = True
+
+# Callables notified of pipeline events (see add_observer)
+_observers = []
+
+def add_observer(observer):
+    """
+    Registers observer(kind, name, value) to be called on pipeline events:
+
+    - 'stage', stage name, seconds: detect, tokenize, preprocess, dedup,
+      tfidf, similarity, rank and select durations
+    - 'count', what, number: sentences, kept_sentences, tokens,
+      duplicate_sentences (with dedup) and matrix_entries of each text
+    - 'fallback', what, 1: no_similarity (original order kept),
+      pagerank_not_converged (TF-IDF scores used) and all_duplicates
+      (dedup would leave fewer than 2 sentences, so it is skipped)
+    - 'error', what, 1: no_text, too_few_sentences, not_enough_content,
+      vectorization and exception
+    - 'cache', result, 1: hit, disk_hit or miss (see SummaryCache)
+
+    Only events of this process are seen, not those of worker processes.
+    Without observers the hooks cost one list check per stage.
+    """
+    _observers.append(observer)
+
+def remove_observer(observer):
+    _observers.remove(observer)
+
+def emit(kind, name, value=1):
+    """Sends an event to the registered observers"""
+    for observer in _observers:
+        observer(kind, name, value)
+
+class _StageTimer:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        emit('stage', self.name, time.perf_counter() - self.start)
+
+_UNTIMED = nullcontext()
+
+def _emit_counts(sentences, kept, token_lists):
+    """Sends the sentence and token counts of one preprocessed text"""
+    if _observers:
+        emit('count', 'sentences', len(sentences))
+        emit('count', 'kept_sentences', len(kept))
+        emit('count', 'tokens', sum(map(len, token_lists)))
+
+def _stage(name):
+    """Times a pipeline stage for the observers; does nothing without observers"""
+    return _StageTimer(name) if _observers else _UNTIMED
+
+def warm_up(language=None):
+    """
+    Imports the pipeline's dependencies and loads its NLTK data up front.
+
+    Long-running processes (servers, worker pools) can call this at startup
+    so that the first request does not pay the import and loading cost, and
+    profiled runs call it so that their report shows the pipeline's hot
+    paths rather than one-off imports. Without a language, the language
+    detector's profiles are loaded too.
+    """
+    import numpy, scipy.sparse, sklearn.feature_extraction.text, sklearn.metrics.pairwise
+    import langdetect
+    if language is None:
+        detect_language("Warm up the language detector, which loads its profiles once.")
+    get_stopwords(language or 'en')
+    multilingual_tokenize("Warm up the tokenizer. It is loaded once per process.", language)
+
+# Fast language detection looks at a fixed-size sample of the text: a prefix
+# plus a few windows from the rest, so its cost does not grow with the text
+DETECTION_PREFIX_CHARS = 1000
+DETECTION_WINDOW_CHARS = 300
+DETECTION_WINDOWS = 3
+
+def _detection_sample(text):
+    """
+    Returns a bounded sample of text for language detection.
+
+    The cut-off words at both ends of each window are dropped. A window
+    left with no words (whitespace runs, a single long token) is skipped,
+    except one with no whitespace at all, which is kept whole since scripts
+    such as Chinese are written without spaces.
+    """
+    budget = DETECTION_PREFIX_CHARS + DETECTION_WINDOWS * DETECTION_WINDOW_CHARS
+    if len(text) <= budget:
+        return text
+    # Seeded by the length so the same text always yields the same sample
+    rng = random.Random(len(text))
+    parts = [text[:DETECTION_PREFIX_CHARS]]
+    for _ in range(DETECTION_WINDOWS):
+        start = rng.randrange(DETECTION_PREFIX_CHARS, len(text) - DETECTION_WINDOW_CHARS)
+        window = text[start:start + DETECTION_WINDOW_CHARS]
+        words = window.split()
+        if len(words) > 2:
+            parts.append(" ".join(words[1:-1]))
+        elif len(words) == 1 and len(words[0]) == len(window):
+            parts.append(window)
+    return "\n".join(parts)
+
+def detect_language(text, fast=True):
+    """
+    Detect the language of the input text
+
+    langdetect is seeded, so the same text is always detected the same way.
+    In fast mode only a bounded sample of the text is examined (see
+    _detection_sample); pass fast=False to run the detector on the full text.
+    """
+    from langdetect import DetectorFactory, detect
+    from langdetect.lang_detect_exception import LangDetectException
+    DetectorFactory.seed = 0
     try:
-        lang_code = detect(text)
+        lang_code = detect(_detection_sample(text) if fast else text)
         return lang_code
-    except (LangDetectException, Exception):
-        return 'en'  # Default to English
+    except LangDetectException:
+        return 'en'  # Default to English (e.g. no letters to go by)
 
+@lru_cache(maxsize=None)
 def get_stopwords(lang_code):
-    """Get stopwords for the detected language"""
+    """Get stopwords for the detected language (loaded once per language)"""
+    from nltk.corpus import stopwords
+    _ensure_nltk_data()
     lang_name = LANGUAGE_MAPPINGS.get(lang_code, 'english')
     try:
-        return set(stopwords.words(lang_name))
+        return frozenset(stopwords.words(lang_name))
     except OSError:
         # If language not available, use English as fallback
-        return set(stopwords.words('english'))
+        return frozenset(stopwords.words('english'))
 
 def multilingual_tokenize(text, lang_code):
     """Tokenize text using NLTK with language-aware processing"""
     # Use NLTK for all languages - it handles most cases well
+    from nltk.tokenize import sent_tokenize
+    _ensure_nltk_data()
     return sent_tokenize(text)
 
-download_nltk_data()
+# Characters kept by clean_text, per script
+_SCRIPT_CHARACTERS = {
+    'arabic': r'\u0600-\u06FF',
+    'devanagari': r'\u0900-\u097F',
+    'kannada': r'\u0C80-\u0CFF',
+    'telugu': r'\u0C00-\u0C7F',
+    'tamil': r'\u0B80-\u0BFF',
+    'malayalam': r'\u0D00-\u0D7F',
+    'bengali': r'\u0980-\u09FF',
+    'gujarati': r'\u0A80-\u0AFF',
+    'gurmukhi': r'\u0A00-\u0A7F',
+    'oriya': r'\u0B00-\u0B7F',
+    'cjk': r'\u4e00-\u9fff\u3040-\u309f\u30a0-\u30ff',
+    'hangul': r'\uac00-\ud7af\u1100-\u11ff\u3130-\u318f',
+    'cyrillic': r'\u0400-\u04FF',
+    'greek': r'\u0370-\u03FF',
+    'latin': r'a-zA-ZÀ-ÿ',
+}
+
+# Script used by each language code; anything not listed is treated as Latin
+_LANGUAGE_SCRIPTS = {
+    'ar': 'arabic', 'fa': 'arabic', 'ur': 'arabic',
+    'hi': 'devanagari', 'ne': 'devanagari', 'mr': 'devanagari',
+    'kn': 'kannada', 'te': 'telugu', 'ta': 'tamil', 'ml': 'malayalam',
+    'bn': 'bengali', 'gu': 'gujarati', 'pa': 'gurmukhi', 'or': 'oriya',
+    'zh': 'cjk', 'ja': 'cjk', 'ko': 'hangul',
+    'ru': 'cyrillic', 'bg': 'cyrillic', 'mk': 'cyrillic', 'sr': 'cyrillic',
+    'el': 'greek',
+}
+
+# Precompiled cleaning patterns, built once at import time
+_CITATION_PATTERN = re.compile(r'\[[0-9]*\]')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_SCRIPT_PATTERNS = {
+    script: re.compile(f'[^{chars}\\s]') for script, chars in _SCRIPT_CHARACTERS.items()
+}
 
 def clean_text(text, lang_code='en'):
     """Removes special characters and lowers the text for different languages."""
-    text = re.sub(r'\[[0-9]*\]', ' ', text)
-    text = re.sub(r'\s+', ' ', text)
+    text = _CITATION_PATTERN.sub(' ', text)
+    text = _WHITESPACE_PATTERN.sub(' ', text)
     
     # Language-specific cleaning
-    if lang_code in ['ar', 'fa', 'ur']:  # Arabic script
-        clean_text = re.sub(r'[^\u0600-\u06FF\s]', ' ', text)
-    elif lang_code in ['hi', 'ne', 'mr']:  # Devanagari script
-        clean_text = re.sub(r'[^\u0900-\u097F\s]', ' ', text)
-    elif lang_code in ['kn']:  # Kannada script
-        clean_text = re.sub(r'[^\u0C80-\u0CFF\s]', ' ', text)
-    elif lang_code in ['te']:  # Telugu script
-        clean_text = re.sub(r'[^\u0C00-\u0C7F\s]', ' ', text)
-    elif lang_code in ['ta']:  # Tamil script
-        clean_text = re.sub(r'[^\u0B80-\u0BFF\s]', ' ', text)
-    elif lang_code in ['ml']:  # Malayalam script
-        clean_text = re.sub(r'[^\u0D00-\u0D7F\s]', ' ', text)
-    elif lang_code in ['bn']:  # Bengali script
-        clean_text = re.sub(r'[^\u0980-\u09FF\s]', ' ', text)
-    elif lang_code in ['gu']:  # Gujarati script
-        clean_text = re.sub(r'[^\u0A80-\u0AFF\s]', ' ', text)
-    elif lang_code in ['pa']:  # Punjabi script
-        clean_text = re.sub(r'[^\u0A00-\u0A7F\s]', ' ', text)
-    elif lang_code in ['or']:  # Oriya script
-        clean_text = re.sub(r'[^\u0B00-\u0B7F\s]', ' ', text)
-    elif lang_code in ['zh', 'ja']:  # Chinese/Japanese
-        clean_text = re.sub(r'[^\u4e00-\u9fff\u3040-\u309f\u30a0-\u30ff\s]', ' ', text)
-    elif lang_code == 'ko':  # Korean
-        clean_text = re.sub(r'[^\uac00-\ud7af\u1100-\u11ff\u3130-\u318f\s]', ' ', text)
-    elif lang_code in ['ru', 'bg', 'mk', 'sr']:  # Cyrillic
-        clean_text = re.sub(r'[^\u0400-\u04FF\s]', ' ', text)
-    elif lang_code in ['el']:  # Greek
-        clean_text = re.sub(r'[^\u0370-\u03FF\s]', ' ', text)
-    else:  # Latin-based languages
-        clean_text = re.sub(r'[^a-zA-ZÀ-ÿ\s]', ' ', text)
+    script = _LANGUAGE_SCRIPTS.get(lang_code, 'latin')
+    clean_text = _SCRIPT_PATTERNS[script].sub(' ', text)
     
     clean_text = clean_text.lower()
     return clean_text
 
+def build_similarity_graph(sentence_vectors, top_k=None, threshold=None, block_size=512):
+    """
+    Builds the sentence similarity graph from the TF-IDF matrix.
+
+    With neither top_k nor threshold set this is the full dense cosine
+    similarity matrix. Otherwise the graph is computed blockwise from the
+    sparse vectors, keeping only each sentence's top_k neighbours and/or the
+    edges with similarity >= threshold, and returned as a symmetric CSR
+    matrix whose size grows linearly with the number of sentences.
+    """
+    import numpy as np
+    from scipy import sparse
+    from sklearn.metrics.pairwise import cosine_similarity
+    from sklearn.preprocessing import normalize
+    if top_k is None and threshold is None:
+        sim_mat = cosine_similarity(sentence_vectors)
+        np.fill_diagonal(sim_mat, 0)
+        return sim_mat
+
+    vectors = normalize(sparse.csr_matrix(sentence_vectors))
+    vectors_t = vectors.T.tocsc()
+    n = vectors.shape[0]
+    rows, cols, vals = [], [], []
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        block = (vectors[start:stop] @ vectors_t).toarray()
+        block[np.arange(stop - start), np.arange(start, stop)] = 0
+        if threshold is not None:
+            block[block < threshold] = 0
+        if top_k is not None and top_k < n:
+            # Zero everything except the k largest entries of each row
+            drop = np.argpartition(-block, top_k, axis=1)[:, top_k:]
+            np.put_along_axis(block, drop, 0, axis=1)
+        block_rows, block_cols = np.nonzero(block)
+        rows.append(block_rows + start)
+        cols.append(block_cols)
+        vals.append(block[block_rows, block_cols])
+
+    graph = sparse.csr_matrix(
+        (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(n, n),
+    )
+    # Keep the graph undirected: an edge survives if either endpoint kept it
+    return graph.maximum(graph.T).tocsr()
+
+class RankingError(Exception):
+    """Raised when a ranker cannot produce scores for a similarity graph."""
+
+def pagerank(sim_mat, damping=0.85, max_iter=1000, tol=1e-6, nstart=None, personalization=None):
+    """
+    Scores the nodes of a weighted similarity graph with PageRank.
+
+    Runs power iteration directly on the (dense or scipy sparse) similarity
+    matrix, using the same conventions as networkx: rows are normalised by
+    their weight, dangling nodes redistribute uniformly and convergence is
+    reached when the L1 change drops below n * tol.
+
+    nstart is an optional starting vector, such as the scores of an earlier
+    version of the graph; when the graph changed little, power iteration
+    then converges in far fewer iterations.
+
+    personalization optionally weights the random jumps (and the mass of
+    dangling nodes) towards some nodes instead of spreading it uniformly.
+
+    A float32 matrix is iterated in float32, so it is never copied to float64.
+    """
+    import numpy as np
+    n = sim_mat.shape[0]
+    dtype = np.result_type(sim_mat.dtype, np.float32)
+    if n == 0:
+        return np.zeros(0, dtype=dtype)
+
+    out_weight = np.asarray(sim_mat.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inv_weight = np.zeros(n, dtype=dtype)
+    inv_weight[~dangling] = 1.0 / out_weight[~dangling]
+    transposed = sim_mat.T
+
+    uniform = 1.0 / n
+    if personalization is None:
+        teleport = uniform
+    else:
+        teleport = np.asarray(personalization, dtype=dtype)
+        teleport = teleport / teleport.sum()
+    if nstart is None:
+        x = np.full(n, uniform, dtype=dtype)
+    else:
+        x = np.asarray(nstart, dtype=dtype)
+        x = x / x.sum()
+    for _ in range(max_iter):
+        x_last = x
+        x = damping * np.asarray(transposed @ (x_last * inv_weight)).ravel()
+        x += (damping * x_last[dangling].sum() + 1.0 - damping) * teleport
+        if np.abs(x - x_last).sum() < n * tol:
+            return x
+    raise RankingError(f"PageRank failed to converge in {max_iter} iterations.")
+
+def _rank_numpy(sim_mat, personalization=None):
+    return pagerank(sim_mat, max_iter=1000, tol=1e-6, personalization=personalization)
+
+def _rank_networkx(sim_mat, personalization=None):
+    import networkx as nx
+    import numpy as np
+    from scipy import sparse
+    if sparse.issparse(sim_mat):
+        nx_graph = nx.from_scipy_sparse_array(sim_mat)
+    else:
+        nx_graph = nx.from_numpy_array(sim_mat)
+    try:
+        if personalization is not None:
+            personalization = dict(enumerate(personalization))
+        scores = nx.pagerank(nx_graph, max_iter=1000, tol=1e-6, personalization=personalization)
+    except (nx.PowerIterationFailedConvergence, nx.NetworkXError) as e:
+        raise RankingError(str(e))
+    return np.array([scores[i] for i in range(len(scores))])
+
+# Available sentence rankers, selectable with summarize_text(ranker=...)
+RANKERS = {
+    'numpy': _rank_numpy,
+    'networkx': _rank_networkx,
+}
+
+def rank_graph(sim_mat, ranker='numpy', personalization=None):
+    """Scores every sentence in the similarity matrix with the chosen ranker."""
+    try:
+        rank = RANKERS[ranker]
+    except KeyError:
+        raise ValueError(f"Unknown ranker '{ranker}'. Choose from: {', '.join(RANKERS)}")
+    return rank(sim_mat, personalization)
+
 def remove_stopwords(sentence, lang_code='en'):
     """Removes stopwords from a sentence in the detected language."""
+    from nltk.tokenize import word_tokenize
     stop_words = get_stopwords(lang_code)
     words = word_tokenize(sentence)
     filtered_words = [word for word in words if word.lower() not in stop_words]
     return " ".join(filtered_words)
 
-def summarize_text(article_text, num_sentences=5, language=None):
+def _blank_match(match):
+    return ' ' * len(match.group())
+
+def tokenize_sentences(text, sentences, lang_code='en'):
     """
-    Summarizes the given text using TF-IDF and PageRank with multilingual support.
+    Cleans the whole document in one pass and returns each sentence's tokens.
+
+    The cleaning regexes run once over the full text and only ever replace
+    characters with the same number of spaces, so the sentence offsets found
+    in the original text still apply to the cleaned one. Each sentence's slice
+    is then lowered and split on whitespace (cleaning leaves only letters), and
+    one-letter words and stopwords are dropped.
+
+    For Latin, Cyrillic or Greek text these are the tokens TfidfVectorizer's
+    default pattern found before, but not for scripts written with combining
+    vowel signs (Tamil, Hindi, Bengali...): that pattern's \\w does not match
+    the signs, so it cut words into fragments and dropped most of them,
+    while whitespace splitting keeps whole words. Rankings of such texts
+    therefore differ from those of the old pipeline.
+    """
+    return _sentence_tokens(text, _clean_document(text, lang_code), sentences, lang_code)
+
+def _clean_document(text, lang_code='en'):
+    """Blanks out citations and characters outside the language's script"""
+    script = _LANGUAGE_SCRIPTS.get(lang_code, 'latin')
+    cleaned = _CITATION_PATTERN.sub(_blank_match, text)
+    return _SCRIPT_PATTERNS[script].sub(' ', cleaned)
+
+def _sentence_tokens(text, cleaned, sentences, lang_code='en'):
+    """Splits each sentence's slice of the cleaned text, dropping stopwords"""
+    stop_words = get_stopwords(lang_code)
+    token_lists = []
+    position = 0
+    for sentence in sentences:
+        start = text.find(sentence, position)
+        if start < 0:
+            # Not a verbatim slice of the text; clean this sentence on its own
+            segment = clean_text(sentence, lang_code)
+        else:
+            position = start + len(sentence)
+            segment = cleaned[start:position].lower()
+        token_lists.append([word for word in segment.split()
+                            if len(word) > 1 and word not in stop_words])
+    return token_lists
+
+def _identity_analyzer(tokens):
+    return tokens
+
+# Columns terms are hashed to in compact mode
+COMPACT_FEATURES = 2 ** 20
+
+def _compact_tfidf(token_lists):
+    """
+    TF-IDF rows of one document's sentences for compact mode.
+
+    Terms are hashed to COMPACT_FEATURES columns, so no vocabulary dict is
+    built; term frequencies are sublinear (1 + log tf) and the matrix is
+    float32, so the similarity matrix and PageRank built from it are too.
+    The IDF is the document's own, computed on the hashed columns.
+    """
+    import numpy as np
+    from sklearn.feature_extraction.text import HashingVectorizer
+    from sklearn.preprocessing import normalize
+    vectorizer = HashingVectorizer(analyzer=_identity_analyzer, n_features=COMPACT_FEATURES,
+                                   alternate_sign=False, norm=None, dtype=np.float32)
+    vectors = vectorizer.transform(token_lists)
+    np.log(vectors.data, out=vectors.data)
+    vectors.data += 1
+    _, inverse, doc_freq = np.unique(vectors.indices, return_inverse=True, return_counts=True)
+    idf = np.log((1.0 + vectors.shape[0]) / (1.0 + doc_freq)) + 1.0
+    vectors.data *= idf.astype(np.float32)[inverse]
+    return normalize(vectors)
+
+class SummarizationError(Exception):
+    """Raised when a text cannot be summarized; the message is shown to the user."""
+
+    def __init__(self, message, language=None):
+        super().__init__(message)
+        self.language = language
+
+class Summary(str):
+    """
+    A summary as returned by summarize_text.
+
+    It is the summary string itself, so it can be printed, compared and
+    serialised as before, and also carries the language the text was
+    processed in and whether the string is an error message.
+    """
+
+    def __new__(cls, text, language=None, error=False):
+        summary = super().__new__(cls, text)
+        summary.language = language
+        summary.error = error
+        return summary
+
+class RankedDocument:
+    """
+    The sentences of a text ranked from most to least important.
+
+    sentences holds every sentence in document order, order the positions of
+    the ranked sentences (best first) and scores their matching scores.
+    Ranking is the expensive part of summarization, so a RankedDocument can
+    be kept and sliced to any summary length in O(num_sentences).
+    """
+
+    def __init__(self, sentences, order, scores, language):
+        self.sentences = list(sentences)
+        self.order = list(order)
+        self.scores = [float(score) for score in scores]
+        self.language = language
+
+    def __len__(self):
+        return len(self.order)
+
+    def top(self, num_sentences):
+        """Return (position, score, sentence) for the best num_sentences sentences"""
+        return [(position, score, self.sentences[position])
+                for position, score in zip(self.order[:num_sentences], self.scores[:num_sentences])]
+
+    def summary(self, num_sentences=5, document_order=False):
+        """
+        Join the best num_sentences sentences into a summary.
+
+        Sentences come best first, as summarize_text returns them, or in the
+        order they appear in the text when document_order is set.
+        """
+        positions = self.order[:num_sentences]
+        if document_order:
+            positions = sorted(positions)
+        return Summary(" ".join(self.sentences[position] for position in positions), self.language)
+
+    def to_dict(self):
+        return {
+            'sentences': self.sentences,
+            'order': self.order,
+            'scores': self.scores,
+            'language': self.language,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['sentences'], data['order'], data['scores'], data['language'])
+
+def _rank_vectors(sentences, kept, sentence_vectors, language, ranker='numpy', top_k=None,
+                  threshold=None, multiplicity=None):
     """
+    Ranks the kept sentences from their TF-IDF vectors.
+
+    kept holds the index in sentences of each row of sentence_vectors, and
+    multiplicity, if given, how many near-duplicate sentences each one
+    stands for: PageRank's random jumps favour them by 1 + log(multiplicity),
+    so repetition counts without letting boilerplate dominate.
+    """
+    import numpy as np
+    # 4. Build similarity matrix
+    with _stage('similarity'):
+        sim_mat = build_similarity_graph(sentence_vectors, top_k, threshold)
+    if _observers:
+        # Stored entries: n * n for the dense matrix, the edges for a sparse graph
+        emit('count', 'matrix_entries', sim_mat.size)
+    
+    # Check if similarity matrix has any connections
+    if sim_mat.sum() == 0:
+        # Fallback: keep the original sentence order
+        emit('fallback', 'no_similarity')
+        return RankedDocument(sentences, range(len(sentences)), [0.0] * len(sentences), language)
+    
+    # 5. Use PageRank to score sentences
+    personalization = None
+    if multiplicity is not None and max(multiplicity) > 1:
+        personalization = 1.0 + np.log(multiplicity)
     try:
-        # Input validation
-        if not article_text or not article_text.strip():
-            return "Error: No text provided."
-        
-        # Detect language if not provided
-        if language is None:
+        with _stage('rank'):
+            scores = rank_graph(sim_mat, ranker, personalization)
+    except RankingError:
+        # Fallback: use TF-IDF scores
+        emit('fallback', 'pagerank_not_converged')
+        scores = np.asarray(sentence_vectors.mean(axis=1)).ravel()
+    
+    # 6. Rank sentences from best to worst
+    ranked = sorted(range(len(kept)), key=lambda j: (scores[j], sentences[kept[j]]), reverse=True)
+    return RankedDocument(sentences, [kept[j] for j in ranked], [scores[j] for j in ranked], language)
+
+def rank_document(article_text, language=None, ranker='numpy', top_k=None, threshold=None,
+                  chunk_size=None, candidates=10, jobs=None, progress=None, idf_model=None,
+                  compact=False, dedup=False):
+    """
+    Ranks the sentences of a text and returns them as a RankedDocument.
+
+    This is the ranking behind summarize_text: a summary of any length is
+    rank_document(...).summary(num_sentences). Raises SummarizationError for
+    text that cannot be summarized.
+
+    With chunk_size set, documents longer than chunk_size sentences are
+    ranked hierarchically (see _rank_hierarchical): only the best candidates
+    of each chunk take part in the final ranking, using jobs processes.
+    chunk_size must be at least 2, and candidates is capped at half of it.
+
+    progress, if given, is called with the name of each stage as it starts:
+    'tokenizing', 'vectorizing' and 'ranking'.
+
+    idf_model, a pre-fitted model of the text's language (see idf_model.py),
+    replaces the IDF learned from the text's own sentences with corpus-wide
+    weights, and the sentences are only transformed, not fitted.
+
+    compact trades the vocabulary-based TF-IDF for a hashing vectorizer with
+    sublinear term frequencies (see _compact_tfidf) and keeps the vectors,
+    the similarity matrix and PageRank in float32, for about half the peak
+    memory. With idf_model, the model's vectors are converted to float32.
+
+    dedup collapses near-duplicate sentences (repeated headers, footers and
+    disclaimers) before vectorization, keeping the first of each group with
+    its multiplicity as a ranking weight (see dedup.py and _rank_vectors).
+    If fewer than 2 sentences would remain, the text is ranked without it.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    if chunk_size and chunk_size < 2:
+        raise ValueError("chunk_size must be at least 2 sentences")
+    if chunk_size:
+        candidates = max(1, min(candidates, chunk_size // 2))
+
+    # Input validation
+    if not article_text or not article_text.strip():
+        emit('error', 'no_text')
+        raise SummarizationError("Error: No text provided.")
+    
+    # Detect language if not provided
+    if language is None:
+        with _stage('detect'):
             language = detect_language(article_text)
-        
-        # 1. Tokenize into sentences using appropriate method
+    
+    # 1. Tokenize into sentences using appropriate method
+    if progress:
+        progress('tokenizing')
+    with _stage('tokenize'):
         sentences = multilingual_tokenize(article_text, language)
+    if len(sentences) < 2:
+        emit('error', 'too_few_sentences')
+        raise SummarizationError("Error: Text must contain at least 2 sentences to summarize.", language)
+    
+    # 2. Clean and tokenize the whole document in one pass
+    with _stage('preprocess'):
+        token_lists = tokenize_sentences(article_text, sentences, language)
+        # Indices of the sentences that still have content after cleaning
+        kept = [i for i, tokens in enumerate(token_lists) if tokens]
+    _emit_counts(sentences, kept, token_lists)
+    
+    multiplicity = None
+    if dedup:
+        from dedup import collapse_near_duplicates
+        with _stage('dedup'):
+            collapsed, multiplicity = collapse_near_duplicates(kept, token_lists)
+        if len(collapsed) >= 2:
+            if _observers:
+                emit('count', 'duplicate_sentences', len(kept) - len(collapsed))
+            kept = collapsed
+        else:
+            # Nearly all one repeated sentence: rank the text as it is rather
+            # than reject what summarizes fine without dedup
+            emit('fallback', 'all_duplicates')
+            multiplicity = None
+    
+    if len(kept) < 2:
+        emit('error', 'not_enough_content')
+        raise SummarizationError("Error: Not enough meaningful content to summarize.", language)
+    
+    if progress:
+        progress('vectorizing')
+    if chunk_size and len(kept) > chunk_size:
+        # 3-6. Long document: rank it chunk by chunk, then rank the best candidates
+        return _rank_hierarchical(sentences, kept, token_lists, language, chunk_size, candidates,
+                                  jobs, ranker, top_k, threshold, idf_model, compact, multiplicity)
+    
+    # 3. Create sentence vectors using TF-IDF
+    # Sentences are already tokenized and stopword-free, so they are fed
+    # to the vectorizer as token lists instead of being re-tokenized
+    kept_tokens = [token_lists[i] for i in kept]
+    try:
+        with _stage('tfidf'):
+            if idf_model is not None:
+                sentence_vectors = idf_model.transform(kept_tokens)
+                if compact:
+                    sentence_vectors = sentence_vectors.astype('float32')
+            elif compact:
+                sentence_vectors = _compact_tfidf(kept_tokens)
+            else:
+                vectorizer = TfidfVectorizer(min_df=1, analyzer=_identity_analyzer)
+                sentence_vectors = vectorizer.fit_transform(kept_tokens)
+    except ValueError as e:
+        emit('error', 'vectorization')
+        raise SummarizationError(f"Error in vectorization: {str(e)}", language)
+    
+    # 4-6. Rank the sentences
+    if progress:
+        progress('ranking')
+    return _rank_vectors(sentences, kept, sentence_vectors, language, ranker, top_k, threshold,
+                         multiplicity)
+
+def summarize_text(article_text, num_sentences=5, language=None, ranker='numpy',
+                   top_k=None, threshold=None, chunk_size=None, jobs=None, idf_model=None,
+                   compact=False, dedup=False, candidates=None):
+    """
+    Summarizes the given text using TF-IDF and PageRank with multilingual support.
+
+    ranker selects the PageRank implementation (see RANKERS): 'numpy' runs
+    vectorized power iteration on the similarity matrix, 'networkx' uses the
+    original graph-based implementation.
+
+    top_k and threshold switch to a sparse similarity graph that only keeps
+    each sentence's top_k neighbours and/or edges above threshold, so memory
+    grows linearly with the number of sentences on very long documents.
+
+    chunk_size enables hierarchical summarization for documents with more
+    sentences than that: chunks are ranked separately and only their best
+    sentences are ranked together, so cost grows near-linearly with length;
+    with jobs > 1 the chunks are ranked in that many processes. Each chunk
+    keeps at least candidates sentences (default: 10, or num_sentences if
+    more, up to half of chunk_size); more candidates cost more time and make
+    the result closer to ranking the whole document at once. chunk_size is
+    raised to twice num_sentences if smaller, so that every chunk can keep
+    enough candidates for the whole summary.
+
+    idf_model weights terms with IDF learned offline from a corpus (see
+    rank_document), for rankings that are stable from one text to the next.
+
+    compact lowers peak memory by about half: hashed, sublinear TF-IDF and
+    float32 similarities and scores, for a near-identical ranking.
+
+    dedup collapses near-duplicate sentences such as the headers and footers
+    repeated on every page of a PDF, so they are neither ranked many times
+    nor picked more than once.
+
+    The result is a Summary: the summary string, whose language attribute
+    holds the detected (or given) language, so callers that display the
+    language do not need to detect it a second time.
+    """
+    if candidates is None:
+        candidates = max(10, num_sentences)
+    if chunk_size:
+        chunk_size = max(chunk_size, 2 * num_sentences)
+        candidates = min(candidates, chunk_size // 2)
+    try:
+        document = rank_document(article_text, language, ranker, top_k, threshold, chunk_size,
+                                 candidates, jobs=jobs, idf_model=idf_model, compact=compact,
+                                 dedup=dedup)
+    except SummarizationError as e:
+        return Summary(str(e), e.language, error=True)
+    except Exception as e:
+        emit('error', 'exception')
+        return Summary(f"Error during summarization: {str(e)}", language, error=True)
+    
+    # 7. Get the top 'num_sentences' sentences for the summary
+    with _stage('select'):
+        return document.summary(num_sentences)
+
+def _batch_tfidf(token_lists_per_doc):
+    """
+    Builds per-document TF-IDF vectors for many documents at once.
+
+    All documents share one vocabulary and one sparse count matrix, and each
+    document's IDF is computed from its own sentences exactly as a
+    TfidfVectorizer fitted on that document alone would (smooth IDF, L2 rows).
+    Returns the stacked matrix and the row offset of each document.
+    """
+    import numpy as np
+    from scipy import sparse
+    from sklearn.preprocessing import normalize
+    vocabulary = {}
+    rows, cols, offsets = [], [], [0]
+    row = 0
+    for token_lists in token_lists_per_doc:
+        for tokens in token_lists:
+            for token in tokens:
+                cols.append(vocabulary.setdefault(token, len(vocabulary)))
+            rows.extend([row] * len(tokens))
+            row += 1
+        offsets.append(row)
+
+    counts = sparse.csr_matrix(
+        (np.ones(len(cols)), (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64))),
+        shape=(row, max(len(vocabulary), 1)),
+    )
+    counts.sum_duplicates()
+
+    # Document frequency of every (document, term) pair, computed for all
+    # documents in a single vectorized pass
+    offsets = np.array(offsets)
+    doc_sizes = np.diff(offsets)
+    entry_rows = np.repeat(np.arange(row), np.diff(counts.indptr))
+    entry_docs = np.repeat(np.arange(len(doc_sizes)), doc_sizes)[entry_rows]
+    keys = entry_docs * counts.shape[1] + counts.indices
+    _, inverse, doc_freq = np.unique(keys, return_inverse=True, return_counts=True)
+    n_docs = doc_sizes[entry_docs]
+    counts.data = counts.data * (np.log((1.0 + n_docs) / (1.0 + doc_freq[inverse])) + 1.0)
+    return normalize(counts), offsets
+
+def _corpus_tfidf(token_lists_per_doc, idf_model=None, compact=False):
+    """
+    _batch_tfidf, or the same stacked rows weighted by a pre-fitted idf_model
+    and/or built in compact mode (see rank_document)
+    """
+    import numpy as np
+    from scipy import sparse
+    if idf_model is None and not compact:
+        return _batch_tfidf(token_lists_per_doc)
+    token_lists_per_doc = list(token_lists_per_doc)
+    offsets = np.cumsum([0] + [len(token_lists) for token_lists in token_lists_per_doc])
+    if idf_model is not None:
+        vectors = idf_model.transform([tokens for token_lists in token_lists_per_doc
+                                       for tokens in token_lists])
+        return (vectors.astype(np.float32) if compact else vectors), offsets
+    return sparse.vstack([_compact_tfidf(token_lists) for token_lists in token_lists_per_doc],
+                         format='csr'), offsets
+
+def summarize_many(texts, num_sentences=5, language=None, ranker='numpy',
+                   top_k=None, threshold=None, batch_size=64, jobs=None):
+    """
+    Summarizes many texts, yielding one summary per text in input order.
+
+    Texts are read in batches of batch_size and grouped by language, so each
+    group shares its stopwords, tokenizer and a single TF-IDF build instead of
+    fitting one vectorizer per document. Results match summarize_text, and
+    texts can be any iterable, so arbitrarily large corpora can be streamed.
+
+    With jobs > 1 the batches are summarized in a pool of that many worker
+    processes, each pre-warmed once at startup (see _init_worker). Only a
+    couple of batches per worker are in flight at a time, so memory stays
+    bounded however many texts are streamed through.
+    """
+    summarize_batch = partial(_summarize_batch, num_sentences=num_sentences, language=language,
+                              ranker=ranker, top_k=top_k, threshold=threshold)
+    batches = _batches(texts, batch_size)
+    if not jobs or jobs <= 1:
+        for batch in batches:
+            yield from summarize_batch(batch)
+        return
+
+    with create_worker_pool(jobs, language) as executor:
+        for summaries in bounded_map(executor, summarize_batch, batches, 2 * jobs):
+            yield from summaries
+
+def create_worker_pool(jobs, language=None):
+    """Creates a process pool whose workers are pre-warmed by _init_worker."""
+    return ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                               initargs=(language,))
+
+def bounded_map(executor, func, iterable, max_pending):
+    """
+    Maps func over iterable on executor, yielding results in input order.
+
+    At most max_pending calls are submitted ahead of the consumer, so
+    arbitrarily long inputs are processed with constant memory.
+    """
+    pending = deque()
+    for item in iterable:
+        pending.append(executor.submit(func, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def _batches(texts, batch_size):
+    texts = iter(texts)
+    while True:
+        batch = list(islice(texts, batch_size))
+        if not batch:
+            return
+        yield batch
+
+# Kept alive so the BLAS thread limit set in a worker stays in effect
+_worker_thread_limits = None
+
+def _init_worker(language=None):
+    """
+    Prepares a summarization worker process.
+
+    Each worker imports the pipeline and loads the stopwords and sentence
+    tokenizer once up front instead of on its first document, then pins
+    the BLAS libraries numpy loaded to a single thread so that N workers
+    use N cores (when threadpoolctl, which scikit-learn installs, is there).
+    """
+    global _worker_thread_limits
+    warm_up(language)
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    _worker_thread_limits = threadpool_limits(limits=1)
+
+def _summarize_batch(batch, num_sentences, language, ranker, top_k, threshold):
+    summaries = [None] * len(batch)
+    groups = {}
+    for index, text in enumerate(batch):
+        if not text or not text.strip():
+            emit('error', 'no_text')
+            summaries[index] = Summary("Error: No text provided.", error=True)
+            continue
+        if language is not None:
+            lang_code = language
+        else:
+            with _stage('detect'):
+                lang_code = detect_language(text)
+        groups.setdefault(lang_code, []).append(index)
+
+    # The same stages, counts and errors as rank_document, per document
+    for lang_code, indices in groups.items():
+        documents = []
+        for index in indices:
+            try:
+                with _stage('tokenize'):
+                    sentences = multilingual_tokenize(batch[index], lang_code)
+                if len(sentences) < 2:
+                    emit('error', 'too_few_sentences')
+                    summaries[index] = Summary(
+                        "Error: Text must contain at least 2 sentences to summarize.", lang_code, error=True)
+                    continue
+                with _stage('preprocess'):
+                    token_lists = tokenize_sentences(batch[index], sentences, lang_code)
+                    kept = [i for i, tokens in enumerate(token_lists) if tokens]
+                _emit_counts(sentences, kept, token_lists)
+                if len(kept) < 2:
+                    emit('error', 'not_enough_content')
+                    summaries[index] = Summary(
+                        "Error: Not enough meaningful content to summarize.", lang_code, error=True)
+                    continue
+                documents.append((index, sentences, kept, [token_lists[i] for i in kept]))
+            except Exception as e:
+                emit('error', 'exception')
+                summaries[index] = Summary(f"Error during summarization: {str(e)}", lang_code, error=True)
+
+        if not documents:
+            continue
+        with _stage('tfidf'):
+            vectors, offsets = _batch_tfidf(tokens for _, _, _, tokens in documents)
+        for position, (index, sentences, kept, _) in enumerate(documents):
+            try:
+                sentence_vectors = vectors[offsets[position]:offsets[position + 1]]
+                document = _rank_vectors(sentences, kept, sentence_vectors, lang_code,
+                                         ranker, top_k, threshold)
+                with _stage('select'):
+                    summaries[index] = document.summary(num_sentences)
+            except Exception as e:
+                emit('error', 'exception')
+                summaries[index] = Summary(f"Error during summarization: {str(e)}", lang_code, error=True)
+    return summaries
+
+def _rank_chunks(chunks, language, candidates, ranker='numpy', top_k=None, threshold=None,
+                 idf_model=None, compact=False):
+    """
+    Ranks each chunk on its own and returns the positions of its best sentences.
+
+    chunks is a list of (positions, sentences, token_lists) triples; the TF-IDF
+    vectors of all of them are built in one pass, each with its own IDF.
+    """
+    vectors, offsets = _corpus_tfidf((token_lists for _, _, token_lists in chunks), idf_model,
+                                     compact)
+    best = []
+    for index, (positions, sentences, _) in enumerate(chunks):
+        chunk_vectors = vectors[offsets[index]:offsets[index + 1]]
+        document = _rank_vectors(sentences, range(len(sentences)), chunk_vectors, language,
+                                 ranker, top_k, threshold)
+        best.extend(positions[local] for local in document.order[:candidates])
+    return best
+
+def _rank_hierarchical(sentences, kept, token_lists, language, chunk_size=200, candidates=10,
+                       jobs=None, ranker='numpy', top_k=None, threshold=None, idf_model=None,
+                       compact=False, multiplicity=None):
+    """
+    Ranks a long document with a map-reduce over fixed windows of sentences.
+
+    Map: the kept sentences are split into windows of chunk_size sentences
+    and each window is ranked on its own, keeping its best candidates.
+    Reduce: the pooled candidates are ranked together; if there are still
+    more than chunk_size of them the map step is repeated on them first.
+    Every ranking involves at most chunk_size sentences, so the cost is
+    near-linear in the document length instead of quadratic. multiplicity,
+    aligned with kept, weights the final ranking (see _rank_vectors).
+
+    candidates is the least each chunk keeps. When there are few chunks each
+    keeps more (up to half of it), so the pool refills about chunk_size
+    sentences instead of shrinking level after level: a 20,000-sentence
+    document with chunk_size=200 still has ~200 candidates in its final
+    ranking, not 50. The trade-off is accuracy: a sentence that is not among
+    its chunk's best is never ranked against the whole document, and the
+    returned RankedDocument only holds the final candidates, so ask for at
+    least as many candidates as summary sentences (summarize_text does).
+    """
+    if candidates * 2 > chunk_size:
+        raise ValueError("candidates must be at most half of chunk_size")
+
+    positions = kept
+    while len(positions) > chunk_size:
+        chunks = []
+        for start in range(0, len(positions), chunk_size):
+            window = positions[start:start + chunk_size]
+            chunks.append((window, [sentences[i] for i in window], [token_lists[i] for i in window]))
+        per_chunk = min(chunk_size // 2, max(candidates, -(-chunk_size // len(chunks))))
+        rank_chunks = partial(_rank_chunks, language=language, candidates=per_chunk,
+                              ranker=ranker, top_k=top_k, threshold=threshold,
+                              idf_model=idf_model, compact=compact)
+
+        if jobs and jobs > 1:
+            # A few tasks per worker, each vectorizing several chunks at once
+            per_task = max(1, len(chunks) // (4 * jobs))
+            tasks = [chunks[i:i + per_task] for i in range(0, len(chunks), per_task)]
+            with create_worker_pool(jobs, language) as executor:
+                results = list(bounded_map(executor, rank_chunks, tasks, 2 * jobs))
+        else:
+            results = [rank_chunks(chunks)]
+        positions = sorted(position for best in results for position in best)
+
+    vectors, _ = _corpus_tfidf([[token_lists[i] for i in positions]], idf_model, compact)
+    if multiplicity is not None:
+        weights = dict(zip(kept, multiplicity))
+        multiplicity = [weights[i] for i in positions]
+    return _rank_vectors(sentences, positions, vectors, language, ranker, top_k, threshold,
+                         multiplicity)
+
+# Heading lines that start a new section in topic mode
+_HEADING_PATTERN = re.compile(
+    r'\n\s*((?:[A-Z][^\n]*|\d+\.\s*[A-Z][^\n]*|Chapter\s+\d+|Section\s+\d+))\s*\n')
+
+def extract_topics(text):
+    """
+    Splits text into (heading, section) pairs based on headings and structure.
+
+    The heading pattern is applied once: splitting on it with a capturing
+    group yields the sections and the headings between them. Text without
+    clear headings is split into paragraphs instead.
+    """
+    topics = []
+    
+    parts = _HEADING_PATTERN.split(text)
+    sections, headings = parts[0::2], parts[1::2]
+    
+    # If no clear headings, split by paragraphs
+    if len(sections) < 3:
+        paragraphs = text.split('\n\n')
+        sections = [p for p in paragraphs if len(p.strip()) > 100]
+        headings = [f"Topic {i+1}" for i in range(len(sections))]
+    
+    # Pair headings with content
+    for i, section in enumerate(sections[1:], 0):  # Skip first empty section
+        if section.strip() and len(section.strip()) > 50:
+            heading = headings[i] if i < len(headings) else f"Topic {i+1}"
+            topics.append((heading.strip(), section.strip()))
+    
+    return topics
+
+def _rank_section(section, language, ranker='numpy', top_k=None, threshold=None):
+    """Ranks one (sentences, kept, vectors) section of a topic summary"""
+    sentences, kept, sentence_vectors = section
+    return _rank_vectors(sentences, kept, sentence_vectors, language, ranker, top_k, threshold)
+
+def summarize_topics(article_text, num_sentences=5, language=None, ranker='numpy',
+                     top_k=None, threshold=None, jobs=None):
+    """
+    Summarizes each section of a structured text (see extract_topics).
+
+    Returns a list of (heading, Summary) pairs, or an empty list when no
+    sections are found. Each section gets num_sentences divided by the
+    number of sections, with at least 2 sentences.
+
+    The language is detected once for the whole text and a single TF-IDF
+    vocabulary is fitted over every section, so the cost is close to that of
+    one flat summary of the text. With jobs > 1 the sections are ranked in
+    that many worker processes.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    topics = extract_topics(article_text)
+    if not topics:
+        return []
+    
+    if language is None:
+        with _stage('detect'):
+            language = detect_language(article_text)
+    per_section = max(2, num_sentences // len(topics))
+    
+    # Tokenize every section, remembering which ones can be ranked; each
+    # section reports the same stages, counts and errors as rank_document
+    results = [None] * len(topics)
+    sections = []
+    for index, (_, content) in enumerate(topics):
+        with _stage('tokenize'):
+            sentences = multilingual_tokenize(content, language)
         if len(sentences) < 2:
-            return "Error: Text must contain at least 2 sentences to summarize."
-        
-        # Adjust num_sentences if it's larger than available sentences
-        num_sentences = min(num_sentences, len(sentences))
-        
-        # 2. Clean and preprocess sentences
-        cleaned_sentences = []
-        for s in sentences:
-            cleaned = remove_stopwords(clean_text(s, language), language)
-            if cleaned.strip():  # Only add non-empty cleaned sentences
-                cleaned_sentences.append(cleaned)
-        
-        if len(cleaned_sentences) < 2:
-            return "Error: Not enough meaningful content to summarize."
-        
-        # 3. Create sentence vectors using TF-IDF
-        # Use language-appropriate stop words
-        lang_name = LANGUAGE_MAPPINGS.get(language, 'english')
-        try:
-            stop_words_list = list(get_stopwords(language))
-            vectorizer = TfidfVectorizer(min_df=1, stop_words=stop_words_list)
-        except:
-            vectorizer = TfidfVectorizer(min_df=1)
-        
-        try:
-            sentence_vectors = vectorizer.fit_transform(cleaned_sentences)
-        except ValueError as e:
-            return f"Error in vectorization: {str(e)}"
-        
-        # 4. Build similarity matrix
-        sim_mat = cosine_similarity(sentence_vectors)
-        np.fill_diagonal(sim_mat, 0)
-        
-        # Check if similarity matrix has any connections
-        if np.sum(sim_mat) == 0:
-            # Fallback: return first few sentences
-            return " ".join(sentences[:num_sentences])
-        
-        # 5. Use PageRank to score sentences
-        nx_graph = nx.from_numpy_array(sim_mat)
-        try:
-            scores = nx.pagerank(nx_graph, max_iter=1000, tol=1e-6)
-        except (nx.PowerIterationFailedConvergence, nx.NetworkXError):
-            # Fallback: use TF-IDF scores
-            tfidf_scores = np.mean(sentence_vectors.toarray(), axis=1)
-            scores = {i: score for i, score in enumerate(tfidf_scores)}
-        
-        # 6. Rank sentences and get the top ones
-        ranked_sentences = sorted(((scores[i], sentences[i]) for i in range(len(sentences)) if i < len(cleaned_sentences)), reverse=True)
-        
-        # 7. Get the top 'num_sentences' sentences for the summary
-        summary_sentences = [s for score, s in ranked_sentences[:num_sentences]]
-        summary = " ".join(summary_sentences)
-        
-        return summary
+            emit('error', 'too_few_sentences')
+            results[index] = Summary("Error: Text must contain at least 2 sentences to summarize.",
+                                     language, error=True)
+            continue
+        with _stage('preprocess'):
+            token_lists = tokenize_sentences(content, sentences, language)
+            kept = [i for i, tokens in enumerate(token_lists) if tokens]
+        _emit_counts(sentences, kept, token_lists)
+        if len(kept) < 2:
+            emit('error', 'not_enough_content')
+            results[index] = Summary("Error: Not enough meaningful content to summarize.",
+                                     language, error=True)
+            continue
+        sections.append((index, sentences, kept, [token_lists[i] for i in kept]))
+    
+    if sections:
+        # One document-wide vocabulary and IDF for all sections
+        with _stage('tfidf'):
+            vectorizer = TfidfVectorizer(min_df=1, analyzer=_identity_analyzer)
+            vectors = vectorizer.fit_transform(tokens for *_, kept_tokens in sections
+                                               for tokens in kept_tokens)
+        tasks, row = [], 0
+        for _, sentences, kept, _ in sections:
+            tasks.append((sentences, kept, vectors[row:row + len(kept)]))
+            row += len(kept)
         
-    except Exception as e:
-        return f"Error during summarization: {str(e)}"
+        rank = partial(_rank_section, language=language, ranker=ranker, top_k=top_k,
+                       threshold=threshold)
+        if jobs and jobs > 1 and len(tasks) > 1:
+            with create_worker_pool(jobs, language) as executor:
+                documents = list(bounded_map(executor, rank, tasks, 4 * jobs))
+        else:
+            documents = map(rank, tasks)
+        for (index, *_), document in zip(sections, documents):
+            with _stage('select'):
+                results[index] = document.summary(per_section)
+    
+    return [(heading, summary) for (heading, _), summary in zip(topics, results)]
 
 def main():
     """
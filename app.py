@@ -1,9 +1,44 @@
-from flask import Flask, render_template, request, jsonify
-from Summarize_Text import summarize_text, detect_language, LANGUAGE_MAPPINGS
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
+from Summarize_Text import (detect_language, summarize_text, summarize_many, summarize_topics,
+                            add_observer, warm_up, LANGUAGE_MAPPINGS)
+from summary_cache import SummaryCache
+from pdf_ingest import extract_pdf_text
+from jobs import JobManager, MemoryJobStore, SQLiteJobStore
+from metrics import PrometheusObserver
+from profiling import Profile
+from collections import deque
+import itertools
+import json
 import os
+import tempfile
+import threading
+import uuid
 
 app = Flask(__name__)
 
+# Repeated submissions of the same text are served from the ranking cache.
+# Set SUMMARY_CACHE_PATH to keep the cache in an SQLite file across restarts.
+summary_cache = SummaryCache(
+    max_entries=int(os.environ.get('SUMMARY_CACHE_SIZE', 1024)),
+    path=os.environ.get('SUMMARY_CACHE_PATH'),
+    max_bytes=int(os.environ.get('SUMMARY_CACHE_BYTES', 256 * 2**20)),
+    max_rows=int(os.environ.get('SUMMARY_CACHE_ROWS', 100000)),
+    ttl=float(os.environ['SUMMARY_CACHE_TTL']) if os.environ.get('SUMMARY_CACHE_TTL') else None,
+)
+
+# Stage timings, counts, fallbacks and cache hits, served at /metrics
+metrics = PrometheusObserver()
+add_observer(metrics)
+
+# Requests may ask to be profiled (X-Profile: 1 or ?profile=1) when
+# PROFILING=1; the cProfile artifacts are written to PROFILE_DIR
+PROFILING = os.environ.get('PROFILING') == '1'
+PROFILE_DIR = os.environ.get('PROFILE_DIR', tempfile.gettempdir())
+
+def profiling_requested(req):
+    flag = req.headers.get('X-Profile') or req.args.get('profile')
+    return PROFILING and flag in ('1', 'true', 'yes')
+
 @app.route('/')
 def index():
     return render_template('index.html', languages=LANGUAGE_MAPPINGS)
@@ -15,15 +50,205 @@ def summarize():
         text = data.get('text', '').strip()
         num_sentences = int(data.get('sentences', 5))
         language = data.get('language')
+        # "dedup": true collapses repeated boilerplate (scraped pages)
+        options = {'dedup': True} if data.get('dedup') else {}
         
         if not text:
             return jsonify({'error': 'No text provided'})
+        if num_sentences < 1:
+            return jsonify({'error': "'sentences' must be at least 1"}), 400
         
         if language == 'auto':
             language = None
             
-        detected_lang = detect_language(text) if language is None else language
-        summary = summarize_text(text, num_sentences, language)
+        profile = None
+        if profiling_requested(request):
+            # Profiled requests skip the cache so the whole pipeline runs; it is
+            # warmed up first so the report is not about one-off imports
+            warm_up(language)
+            with Profile() as profile:
+                summary = summarize_text(text, num_sentences, language, **options)
+        else:
+            # The summary carries the language it was processed in, so the text
+            # is only run through language detection once
+            summary = summary_cache.summarize(text, num_sentences, language, **options)
+        detected_lang = summary.language or language or detect_language(text)
+        
+        result = {
+            'summary': summary,
+            'detected_language': detected_lang,
+            'language_name': LANGUAGE_MAPPINGS.get(detected_lang, detected_lang)
+        }
+        if profile is not None:
+            artifact = os.path.join(PROFILE_DIR, f"summarize-{uuid.uuid4().hex}.prof")
+            result['profile'] = {'report': profile.report(), 'artifact': profile.dump(artifact)}
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'error': str(e)})
+
+def parse_batch_document(item):
+    """(id, text, error) of one document of a batch request"""
+    if isinstance(item, str):
+        return None, item, None
+    if isinstance(item, dict):
+        doc_id, text = item.get('id'), item.get('text', '')
+        if isinstance(text, str):
+            return doc_id, text, None
+        return doc_id, '', "'text' must be a string"
+    return None, '', 'A document must be a string or an object with a \'text\' string'
+
+def iter_batch_documents(req):
+    """
+    Yield (id, text, error) for each document of a batch request.
+
+    The body is either a JSON array or NDJSON (one document per line, read
+    as it arrives). A document is a string or an object with 'text' and an
+    optional 'id', which is echoed back in its result. A document that is
+    not valid (malformed line, wrong type) is yielded with an error, so it
+    only fails its own result.
+    """
+    lines = iter(req.stream)
+    for first in lines:
+        if first.strip():
+            break
+    else:
+        return
+    if first.lstrip().startswith(b'['):
+        try:
+            items = json.loads(first + req.stream.read())
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON array: {str(e)}")
+        if not isinstance(items, list):
+            raise ValueError("Invalid JSON array")
+        for item in items:
+            yield parse_batch_document(item)
+        return
+    for line in itertools.chain([first], lines):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            yield None, '', f"Invalid JSON line: {str(e)}"
+            continue
+        yield parse_batch_document(item)
+
+def positive_int_arg(args, name, default):
+    """Query parameter name as a positive int; ValueError names the parameter"""
+    try:
+        value = int(args.get(name, default))
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise ValueError(f"'{name}' must be a positive integer")
+    return value
+
+@app.route('/summarize/batch', methods=['POST'])
+def summarize_batch():
+    """
+    Summarize many documents in one request, streaming NDJSON results.
+
+    Documents go through summarize_many, so they share preprocessing and
+    TF-IDF work, and each result line is written as soon as its batch is
+    done. 'sentences', 'language' and 'batch_size' are query parameters for
+    the whole request.
+    """
+    try:
+        num_sentences = positive_int_arg(request.args, 'sentences', 5)
+        batch_size = positive_int_arg(request.args, 'batch_size', 64)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    language = request.args.get('language')
+    if language == 'auto':
+        language = None
+    documents = deque()
+    
+    def texts():
+        for doc_id, text, error in iter_batch_documents(request):
+            documents.append((doc_id, error))
+            # Invalid documents still take their place, as empty texts
+            yield text.strip()
+    
+    def generate():
+        try:
+            summaries = summarize_many(texts(), num_sentences, language, batch_size=batch_size,
+                                       jobs=int(os.environ.get('BATCH_JOBS', 1)))
+            for index, summary in enumerate(summaries):
+                record = {'index': index}
+                doc_id, error = documents.popleft()
+                if doc_id is not None:
+                    record['id'] = doc_id
+                if error or summary.error:
+                    record['error'] = error or summary
+                else:
+                    record['summary'] = summary
+                    record['detected_language'] = summary.language
+                    record['language_name'] = LANGUAGE_MAPPINGS.get(summary.language, summary.language)
+                yield json.dumps(record, ensure_ascii=False) + "\n"
+        except Exception as e:
+            yield json.dumps({'error': str(e)}) + "\n"
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/summarize/topics', methods=['POST'])
+def summarize_topics_route():
+    """Summarize each section of a structured text (same fields as /summarize)"""
+    try:
+        data = request.json
+        text = data.get('text', '').strip()
+        num_sentences = int(data.get('sentences', 5))
+        language = data.get('language')
+        
+        if not text:
+            return jsonify({'error': 'No text provided'})
+        
+        if language == 'auto':
+            language = None
+        
+        detected_lang = language or detect_language(text)
+        topics = summarize_topics(text, num_sentences, detected_lang,
+                                  jobs=int(os.environ.get('TOPIC_JOBS', 1)))
+        
+        return jsonify({
+            'topics': [{'heading': heading, 'summary': summary} for heading, summary in topics],
+            'detected_language': detected_lang,
+            'language_name': LANGUAGE_MAPPINGS.get(detected_lang, detected_lang)
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)})
+
+@app.route('/summarize/pdf', methods=['POST'])
+def summarize_pdf():
+    """Summarize an uploaded PDF (multipart field 'file', optional 'pages' range)"""
+    try:
+        upload = request.files.get('file')
+        num_sentences = int(request.form.get('sentences', 5))
+        language = request.form.get('language')
+        pages = request.form.get('pages')
+        # Headers and footers repeat on every page, so near-duplicates are
+        # collapsed unless dedup=0 is sent
+        dedup = request.form.get('dedup', '1') != '0'
+        
+        if upload is None:
+            return jsonify({'error': 'No PDF provided'})
+        
+        if language == 'auto':
+            language = None
+        
+        # Pages are extracted from a file on disk so worker processes can open it
+        fd, path = tempfile.mkstemp(suffix='.pdf')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                upload.save(f)
+            text = extract_pdf_text(path, pages, jobs=int(os.environ.get('PDF_JOBS', 1)))
+        finally:
+            os.remove(path)
+        
+        if not text.strip():
+            return jsonify({'error': 'No text found in PDF'})
+        
+        summary = summary_cache.summarize(text, num_sentences, language, dedup=dedup)
+        detected_lang = summary.language or language or detect_language(text)
         
         return jsonify({
             'summary': summary,
@@ -33,6 +258,89 @@ def summarize():
     except Exception as e:
         return jsonify({'error': str(e)})
 
+@app.route('/rank', methods=['POST'])
+def rank():
+    """
+    Return every sentence ranked by importance, best first.
+
+    A summary of any length is the first N entries, so clients can change
+    the summary length without another request.
+    """
+    try:
+        data = request.json
+        text = data.get('text', '').strip()
+        language = data.get('language')
+        
+        if not text:
+            return jsonify({'error': 'No text provided'})
+        
+        if language == 'auto':
+            language = None
+        
+        document = summary_cache.rank_document(text, language)
+        return jsonify({
+            'sentences': [
+                {'position': position, 'score': score, 'text': sentence}
+                for position, score, sentence in document.top(len(document))
+            ],
+            'detected_language': document.language,
+            'language_name': LANGUAGE_MAPPINGS.get(document.language, document.language)
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)})
+
+# Large documents can be summarized as background jobs (see jobs.py); the
+# worker pool is started with the first job. Set JOB_STORE_PATH to keep
+# jobs in an SQLite file that several server processes can poll.
+job_manager = None
+job_manager_lock = threading.Lock()
+
+def get_job_manager():
+    global job_manager
+    with job_manager_lock:
+        if job_manager is None:
+            ttl = float(os.environ.get('JOB_TTL', 3600))
+            store_path = os.environ.get('JOB_STORE_PATH')
+            store = SQLiteJobStore(store_path, ttl) if store_path else MemoryJobStore(ttl)
+            job_manager = JobManager(store, jobs=int(os.environ.get('JOB_WORKERS', 2)))
+        return job_manager
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queue a summarization job (same JSON as /summarize) and return its id at once"""
+    try:
+        data = request.json
+        text = data.get('text', '').strip()
+        num_sentences = int(data.get('sentences', 5))
+        language = data.get('language')
+        
+        if not text:
+            return jsonify({'error': 'No text provided'}), 400
+        
+        if language == 'auto':
+            language = None
+        
+        job_id = get_job_manager().submit(text, num_sentences, language)
+        return jsonify({'id': job_id, 'status': 'queued'}), 202, {'Location': f'/jobs/{job_id}'}
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    """Status, current stage and, once done, the result of a job"""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    return jsonify(job)
+
+@app.route('/metrics')
+def prometheus_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/cache/stats')
+def cache_stats():
+    return jsonify(summary_cache.stats())
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
@@ -0,0 +1,479 @@
+"""
+Production serving path for the Text Summarizer API (ASGI)
+
+Run it with any ASGI server, for example:
+
+    uvicorn asgi_app:app --host 0.0.0.0 --port 8000
+
+POST /summarize and POST /rank are served by the async front end and the
+ranking runs in a bounded pool of pre-warmed worker processes, so large
+posts never block other requests and CPU work is capped at SERVING_JOBS
+documents at a time. When SERVING_QUEUE more documents are already waiting,
+new requests are turned away with 429 and a Retry-After header; requests
+that take longer than REQUEST_TIMEOUT seconds get 503. Every other route of
+the Flask app (the web UI, batch, topics, PDF, jobs, /metrics...) and
+profiled requests (when PROFILING=1) are passed on to app.py in a thread.
+The CPU-heavy ones among them are admitted SERVING_JOBS at a time, with 429
+beyond that, but have no timeout.
+"""
+
+import asyncio
+import io
+import json
+import math
+import os
+import sys
+import threading
+import time
+from urllib.parse import parse_qs
+from concurrent.futures.process import BrokenProcessPool
+from Summarize_Text import (rank_document, create_worker_pool, add_observer, remove_observer, emit,
+                            SummarizationError, LANGUAGE_MAPPINGS)
+from summary_cache import SummaryCache
+
+class Overloaded(Exception):
+    """Raised when the worker pool and its queue are full"""
+
+def _rank_entry(text, language, options=None):
+    """
+    Rank a text in a worker process. Returns (entry, events): the
+    RankedDocument or SummarizationError, and the pipeline observer events,
+    which the server replays so its metrics include work done in workers.
+    """
+    events = []
+    observer = lambda kind, name, value: events.append((kind, name, value))
+    add_observer(observer)
+    try:
+        return rank_document(text, language, **(options or {})), events
+    except SummarizationError as e:
+        return e, events
+    finally:
+        remove_observer(observer)
+
+class WorkerPool:
+    """
+    A process pool that admits at most jobs + max_queue documents at once.
+
+    A document holds its slot until its worker is done with it, even if the
+    request timed out, so the number of documents being processed never
+    exceeds the configured bound. Documents still waiting for a worker when
+    their request times out are cancelled.
+
+    If a worker process dies the executor is broken for good, so it is
+    replaced by a new one; the documents it held fail with BrokenProcessPool.
+    """
+
+    def __init__(self, jobs, max_queue, language=None):
+        self.jobs = jobs
+        self.language = language
+        self.capacity = jobs + max_queue
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.failed = 0
+        self.restarts = 0
+        self.seconds_per_task = 1.0  # moving average, used for Retry-After
+        self._lock = threading.Lock()
+        self._executor = create_worker_pool(jobs, language)
+
+    async def run(self, timeout, func, *args):
+        """Run func(*args) in a worker, raising Overloaded or asyncio.TimeoutError"""
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                raise Overloaded()
+            self.in_flight += 1
+        started = time.perf_counter()
+        executor = self._executor
+        try:
+            future = executor.submit(func, *args)
+        except BaseException as e:
+            # The slot was taken but no callback will ever give it back
+            with self._lock:
+                self.in_flight -= 1
+            if isinstance(e, BrokenProcessPool):
+                self._replace(executor)
+            raise
+        future.add_done_callback(lambda done: self._release(done, started, executor))
+        try:
+            # shield: a timeout must not cancel the asyncio wrapper, or the
+            # slot would look free while the worker is still busy
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timeouts += 1
+            raise
+
+    def _release(self, future, started, executor):
+        broken = False
+        with self._lock:
+            self.in_flight -= 1
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                self.failed += 1
+                broken = isinstance(future.exception(), BrokenProcessPool)
+            else:
+                self.completed += 1
+                elapsed = time.perf_counter() - started
+                self.seconds_per_task += 0.1 * (elapsed - self.seconds_per_task)
+        if broken:
+            self._replace(executor)
+
+    def _replace(self, executor):
+        """Swap a broken executor for a new one (once, however many notice it)"""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = create_worker_pool(self.jobs, self.language)
+            self.restarts += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def retry_after(self):
+        """Seconds until the current backlog is expected to have drained"""
+        with self._lock:
+            return max(1, math.ceil(self.seconds_per_task * self.in_flight / self.jobs))
+
+    def stats(self):
+        with self._lock:
+            return {
+                'jobs': self.jobs,
+                'capacity': self.capacity,
+                'in_flight': self.in_flight,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts,
+                'failed': self.failed,
+                'restarts': self.restarts,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+# Routes answered by the front end, ranking in the worker pool
+SUMMARIZE = ('POST', '/summarize')
+RANK = ('POST', '/rank')
+
+# Routes of the WSGI app that summarize in the request thread
+THREADED_CPU_ROUTES = {SUMMARIZE, ('POST', '/summarize/topics'), ('POST', '/summarize/pdf'),
+                       ('POST', '/summarize/batch')}
+
+class SummarizerApp:
+    """
+    ASGI application serving POST /summarize and POST /rank (same JSON as
+    the Flask app) and GET /stats. The worker pool is started on the first
+    request or on the ASGI lifespan startup event, whichever comes first.
+
+    Other requests, and /summarize requests asking to be profiled when
+    profiling is on, go to wsgi_app (normally the Flask app) when one is
+    given, else get 404. Of those, the ones that summarize in their thread
+    (THREADED_CPU_ROUTES) are admitted jobs at a time and get 429 beyond.
+    """
+
+    def __init__(self, jobs=None, max_queue=None, timeout=30.0, max_body_bytes=10 * 2**20,
+                 cache=None, wsgi_app=None, profiling=False):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.max_queue = 4 * self.jobs if max_queue is None else max_queue
+        self.timeout = timeout
+        self.max_body_bytes = max_body_bytes
+        self.cache = cache if cache is not None else SummaryCache()
+        self.wsgi_app = wsgi_app
+        self.profiling = profiling
+        self.pool = None
+        # Requests of THREADED_CPU_ROUTES in the WSGI app; only touched on the event loop
+        self.threaded = 0
+        self.threaded_rejected = 0
+
+    def start(self):
+        if self.pool is None:
+            self.pool = WorkerPool(self.jobs, self.max_queue)
+
+    def stop(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            if self.wsgi_app is not None and not self._serves(scope):
+                await self._call_threaded(scope, receive, send)
+                return
+            status, body, headers = await self._handle(scope, receive)
+            await _send_json(send, status, body, headers)
+
+    def _serves(self, scope):
+        """Whether a request is answered here rather than by the WSGI app"""
+        route = (scope['method'], scope['path'])
+        if route in (('GET', '/stats'), RANK):
+            return True
+        # Profiling runs in the request thread, so it is left to the Flask app
+        return route == SUMMARIZE and not self._profiling_requested(scope)
+
+    def _profiling_requested(self, scope):
+        """Same test as app.profiling_requested: X-Profile header, else ?profile="""
+        if not self.profiling:
+            return False
+        flag = dict(scope.get('headers', [])).get(b'x-profile', b'').decode('latin-1')
+        if not flag:
+            query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+            flag = query.get('profile', [''])[0]
+        return flag in ('1', 'true', 'yes')
+
+    async def _call_threaded(self, scope, receive, send):
+        """Pass a request to the WSGI app, admitting jobs CPU-heavy ones at a time"""
+        if (scope['method'], scope['path']) not in THREADED_CPU_ROUTES:
+            await _call_wsgi(self.wsgi_app, scope, receive, send)
+            return
+        if self.threaded >= self.jobs:
+            self.start()
+            self.threaded_rejected += 1
+            await _send_json(send, 429, {'error': 'Server busy, retry later'}, self._retry_after())
+            return
+        self.threaded += 1
+        try:
+            await _call_wsgi(self.wsgi_app, scope, receive, send)
+        finally:
+            self.threaded -= 1
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.start()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.stop()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _handle(self, scope, receive):
+        route = (scope['method'], scope['path'])
+        if route == ('GET', '/stats'):
+            self.start()
+            threaded = {'in_flight': self.threaded, 'capacity': self.jobs,
+                        'rejected': self.threaded_rejected}
+            return 200, {'pool': self.pool.stats(), 'threaded': threaded,
+                         'cache': await asyncio.to_thread(self.cache.stats)}, []
+        if route not in (SUMMARIZE, RANK):
+            return 404, {'error': 'Not found'}, []
+
+        body = await _read_body(receive, self.max_body_bytes)
+        if body is None:
+            return 413, {'error': 'Request body too large'}, []
+        try:
+            data = json.loads(body)
+            text = data.get('text', '').strip()
+            language = data.get('language')
+            num_sentences = int(data.get('sentences', 5)) if route == SUMMARIZE else None
+            # Same ranking options as the Flask app
+            options = {'dedup': True} if route == SUMMARIZE and data.get('dedup') else {}
+        except (ValueError, TypeError, AttributeError) as e:
+            return 400, {'error': f'Invalid request: {e}'}, []
+        if num_sentences is not None and num_sentences < 1:
+            return 400, {'error': "Invalid request: 'sentences' must be at least 1"}, []
+
+        if not text:
+            return 200, {'error': 'No text provided'}, []
+        if language == 'auto':
+            language = None
+
+        entry, failure = await self._ranked(text, language, options)
+        if failure is not None:
+            return failure
+
+        if route == RANK:
+            if isinstance(entry, SummarizationError):
+                return 200, {'error': str(entry)}, []
+            return 200, {
+                'sentences': [
+                    {'position': position, 'score': score, 'text': sentence}
+                    for position, score, sentence in entry.top(len(entry))
+                ],
+                'detected_language': entry.language,
+                'language_name': LANGUAGE_MAPPINGS.get(entry.language, entry.language)
+            }, []
+        if isinstance(entry, SummarizationError):
+            summary, detected_lang = str(entry), entry.language or language
+        else:
+            summary, detected_lang = entry.summary(num_sentences), entry.language
+        return 200, {
+            'summary': summary,
+            'detected_language': detected_lang,
+            'language_name': LANGUAGE_MAPPINGS.get(detected_lang, detected_lang)
+        }, []
+
+    async def _ranked(self, text, language, options):
+        """
+        (entry, None) with the cached or freshly ranked entry, a RankedDocument
+        or SummarizationError, or (None, response) if the pool could not rank it.
+        """
+        self.start()
+        key = self.cache.make_key(text, language, **options)
+        # The cache may be an SQLite file behind a lock: keep it off the event loop
+        entry = await asyncio.to_thread(self.cache.get, key)
+        if entry is None:
+            try:
+                entry, events = await self.pool.run(self.timeout, _rank_entry, text, language,
+                                                    options)
+            except Overloaded:
+                return None, (429, {'error': 'Server busy, retry later'}, self._retry_after())
+            except asyncio.TimeoutError:
+                return None, (503, {'error': 'Summarization timed out'}, self._retry_after())
+            except BrokenProcessPool:
+                # The pool has been replaced; the retry will find fresh workers
+                return None, (503, {'error': 'Worker process failed, retry later'},
+                              self._retry_after())
+            except Exception as e:
+                return None, (500, {'error': f"Error during summarization: {str(e)}"}, [])
+            for event in events:
+                emit(*event)
+            await asyncio.to_thread(self.cache.put, key, entry)
+        return entry, None
+
+    def _retry_after(self):
+        return [(b'retry-after', str(self.pool.retry_after()).encode())]
+
+async def _read_body(receive, limit):
+    """Read the whole request body, or return None once it exceeds limit bytes"""
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > limit:
+            return None
+        chunks.append(chunk)
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+class _RequestBody(io.RawIOBase):
+    """wsgi.input reading the ASGI request body as the WSGI app asks for it"""
+
+    def __init__(self, receive, loop):
+        self._receive = receive
+        self._loop = loop
+        self._pending = b''
+        self._done = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending and not self._done:
+            message = asyncio.run_coroutine_threadsafe(self._receive(), self._loop).result()
+            self._pending = message.get('body', b'')
+            self._done = message['type'] != 'http.request' or not message.get('more_body')
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+def _wsgi_environ(scope, body):
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'],
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.input_terminated': True,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        key = name if name in ('CONTENT_TYPE', 'CONTENT_LENGTH') else f'HTTP_{name}'
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+async def _call_wsgi(wsgi_app, scope, receive, send):
+    """
+    Serve one request with a WSGI app running in a thread.
+
+    The request body is read as the app consumes it and the response is
+    sent chunk by chunk, through a small queue that makes the thread wait
+    for slow clients, so streaming routes such as /summarize/batch stream.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=8)
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response['status'] = int(status.split(' ', 1)[0])
+        response['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                               for name, value in headers]
+
+    def put(item):
+        asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+    def run():
+        try:
+            body = io.BufferedReader(_RequestBody(receive, loop))
+            result = wsgi_app(_wsgi_environ(scope, body), start_response)
+            try:
+                for chunk in result:
+                    if chunk:
+                        put(('body', chunk))
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+            put(('end', None))
+        except BaseException as e:
+            put(('error', e))
+
+    worker = loop.run_in_executor(None, run)
+    started = False
+    while True:
+        kind, value = await queue.get()
+        if kind == 'error' and not started:
+            await worker
+            await _send_json(send, 500, {'error': str(value)})
+            return
+        if not started and 'status' in response:
+            await send({'type': 'http.response.start', 'status': response['status'],
+                        'headers': response['headers']})
+            started = True
+        if kind == 'body':
+            await send({'type': 'http.response.body', 'body': value, 'more_body': True})
+        else:
+            # End of the response (an error once it has started can only cut it short)
+            await send({'type': 'http.response.body', 'body': b''})
+            await worker
+            return
+
+async def _send_json(send, status, body, headers=()):
+    payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'),
+                    (b'content-length', str(len(payload)).encode())] + list(headers),
+    })
+    await send({'type': 'http.response.body', 'body': payload})
+
+def create_app():
+    """The served application: this front end over app.py, sharing its cache and metrics"""
+    import app as flask_module
+    return SummarizerApp(
+        jobs=int(os.environ.get('SERVING_JOBS', 0)) or None,
+        max_queue=int(os.environ['SERVING_QUEUE']) if 'SERVING_QUEUE' in os.environ else None,
+        timeout=float(os.environ.get('REQUEST_TIMEOUT', 30)),
+        cache=flask_module.summary_cache,
+        wsgi_app=flask_module.app,
+        profiling=flask_module.PROFILING,
+    )
+
+app = create_app()
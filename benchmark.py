@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for the Text Summarizer
+"""
+
+import argparse
+import math
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+
+# Child interpreters import the repo's modules, so they run from its directory
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Vocabulary used to generate synthetic articles offline
+WORDS = (
+    "market policy energy climate science data model city river health school "
+    "water price trade growth vote court team game music film design network "
+    "system power light research study report company government student"
+).split()
+
+def generate_text(num_sentences, seed=0):
+    """Generate a synthetic article with the given number of sentences"""
+    rng = random.Random(seed)
+    sentences = []
+    for _ in range(num_sentences):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(6, 15))]
+        sentences.append(" ".join(words).capitalize() + ".")
+    return " ".join(sentences)
+
+def generate_corpus(num_docs, sentences_per_doc, seed=0):
+    """Generate a list of synthetic articles"""
+    return [generate_text(sentences_per_doc, seed + i) for i in range(num_docs)]
+
+# One language per script family, used by the suite unless --languages is given
+SUITE_LANGUAGES = ['en', 'de', 'ru', 'ar', 'hi', 'zh', 'ko', 'ta']
+# Stages summarize_text reports to observers when the language is given
+STAGES = ['tokenize', 'preprocess', 'tfidf', 'similarity', 'rank', 'select']
+
+def script_letters(lang_code):
+    """Lower-case letters of the script Summarize_Text keeps for lang_code"""
+    from Summarize_Text import _SCRIPT_CHARACTERS, _LANGUAGE_SCRIPTS
+    ranges = _SCRIPT_CHARACTERS[_LANGUAGE_SCRIPTS.get(lang_code, 'latin')]
+    ranges = re.sub(r'\\u([0-9a-fA-F]{4})', lambda m: chr(int(m.group(1), 16)), ranges)
+    letters = []
+    for first, last in re.findall(r'(.)-(.)', ranges):
+        letters.extend(ch for ch in map(chr, range(ord(first), ord(last) + 1))
+                       if ch.isalpha() and ch == ch.lower())
+    return letters
+
+def generate_language_text(lang_code, num_sentences, seed=0):
+    """
+    Generate a synthetic article in the script of lang_code, offline.
+
+    Words are random strings of the script's letters drawn with a Zipf-like
+    frequency, mixed with the language's stopwords, so every stage of the
+    pipeline sees realistic work.
+    """
+    from Summarize_Text import get_stopwords, _LANGUAGE_SCRIPTS
+    rng = random.Random(f"{lang_code}-{seed}")
+    letters = script_letters(lang_code)
+    short = _LANGUAGE_SCRIPTS.get(lang_code) in ('cjk', 'hangul')
+    vocabulary = ["".join(rng.choice(letters) for _ in range(rng.randint(1, 3) if short else
+                                                             rng.randint(3, 9)))
+                  for _ in range(500)]
+    weights = [1.0 / rank for rank in range(1, len(vocabulary) + 1)]
+    stop_words = sorted(get_stopwords(lang_code))[:50]
+    sentences = []
+    for _ in range(num_sentences):
+        words = rng.choices(vocabulary, weights, k=rng.randint(6, 15))
+        words += rng.sample(stop_words, min(len(stop_words), rng.randint(1, 4)))
+        rng.shuffle(words)
+        sentences.append(" ".join(words).capitalize() + ".")
+    return " ".join(sentences)
+
+def time_stages(text, language, ranker='numpy'):
+    """
+    Time each stage of summarize_text, in milliseconds.
+
+    summarize_text itself is run, with an observer collecting the stage
+    events it emits (see add_observer), so the timings are those of the
+    code that serves requests. A stage the text skipped is reported as 0.
+    """
+    from Summarize_Text import summarize_text, add_observer, remove_observer
+    timings = dict.fromkeys(STAGES, 0.0)
+
+    def observer(kind, name, value):
+        if kind == 'stage':
+            timings[name] = timings.get(name, 0.0) + value * 1000
+
+    add_observer(observer)
+    try:
+        summarize_text(text, 5, language, ranker=ranker)
+    finally:
+        remove_observer(observer)
+    return timings
+
+def peak_memory_mib(text, language):
+    """Peak memory traced while summarizing text once"""
+    import tracemalloc
+    from Summarize_Text import summarize_text
+    tracemalloc.start()
+    try:
+        summarize_text(text, 5, language)
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+def environment():
+    """Versions that a timing depends on, recorded with every suite run"""
+    import platform
+    from importlib import metadata
+    versions = {}
+    for package in ('numpy', 'scipy', 'scikit-learn', 'nltk', 'networkx'):
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'), 'versions': versions}
+
+def compare_to_baseline(results, baseline, tolerance, min_ms=1.0):
+    """
+    Return the regressions of results against a baseline run: every total or
+    stage that got more than tolerance (e.g. 0.2 = 20%) and min_ms slower.
+    """
+    previous = {(r['language'], r['sentences']): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        old = previous.get((result['language'], result['sentences']))
+        if old is None:
+            continue
+        pairs = [('total', old['total_ms'], result['total_ms'])]
+        pairs += [(stage, old['stages'].get(stage), result['stages'][stage]) for stage in STAGES]
+        for name, before, after in pairs:
+            if before is not None and after > before * (1 + tolerance) and after - before > min_ms:
+                regressions.append((result['language'], result['sentences'], name, before, after))
+    return regressions
+
+def benchmark_suite(args):
+    """Per-stage timings, scaling and peak memory on synthetic multilingual corpora"""
+    import json
+    from Summarize_Text import LANGUAGE_MAPPINGS, summarize_text, warm_up
+
+    languages = list(LANGUAGE_MAPPINGS) if args.languages == ['all'] else args.languages
+    print(f"Pipeline benchmark suite: best of {args.repeat} runs")
+    print("=" * 50)
+    header = f"{'lang':<5}{'sentences':>10}" + "".join(f"{stage:>11}" for stage in STAGES)
+    print(header + f"{'total':>11}{'growth':>8}{'peak MiB':>10}")
+
+    results = []
+    for language in languages:
+        warm_up(language)
+        # Discarded run, so first-call costs do not land on the smallest size
+        time_stages(generate_language_text(language, 10, seed=1), language)
+        previous = None
+        for size in args.sizes:
+            text = generate_language_text(language, size)
+            runs = [time_stages(text, language) for _ in range(args.repeat)]
+            stages = {stage: min(run[stage] for run in runs) for stage in STAGES}
+            totals = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                summarize_text(text, 5, language)
+                totals.append((time.perf_counter() - start) * 1000)
+            result = {'language': language, 'sentences': size, 'stages': stages,
+                      'total_ms': min(totals), 'peak_mib': peak_memory_mib(text, language)}
+            results.append(result)
+
+            # Scaling exponent since the previous size: 1 is linear, 2 quadratic
+            growth = ''
+            if previous and previous['total_ms'] > 0:
+                growth = f"{math.log(result['total_ms'] / previous['total_ms']) / math.log(size / previous['sentences']):.2f}"
+            previous = result
+            print(f"{language:<5}{size:>10}" + "".join(f"{stages[stage]:>11.2f}" for stage in STAGES) +
+                  f"{result['total_ms']:>11.2f}{growth:>8}{result['peak_mib']:>10.1f}")
+
+    run = {'environment': environment(), 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2)
+        print(f"\nResults saved to '{args.output}'")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.tolerance, args.min_ms)
+        print(f"\nCompared with '{args.baseline}' ({baseline['environment']['date']}): "
+              f"{len(regressions)} regression(s) above {args.tolerance:.0%}")
+        for language, size, name, before, after in regressions:
+            print(f"  REGRESSION {language} {size} sentences {name}: "
+                  f"{before:.2f} ms -> {after:.2f} ms ({after / before - 1:+.0%})")
+        if regressions:
+            sys.exit(1)
+
+def benchmark_batch(args):
+    """Compare summarize_many against calling summarize_text in a loop"""
+    from Summarize_Text import summarize_text, summarize_many
+
+    corpus = generate_corpus(args.docs, args.sentences)
+    print(f"Batch benchmark: {args.docs} documents x {args.sentences} sentences")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    looped = [summarize_text(text, args.num, args.language) for text in corpus]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = list(summarize_many(corpus, args.num, args.language, batch_size=args.batch_size))
+    batch_time = time.perf_counter() - start
+
+    print(f"summarize_text loop: {loop_time * 1000 / args.docs:.2f} ms/doc")
+    print(f"summarize_many:      {batch_time * 1000 / args.docs:.2f} ms/doc")
+    print(f"Speedup:             {loop_time / batch_time:.2f}x")
+    print(f"Identical summaries: {looped == batched}")
+
+def benchmark_hierarchical(args):
+    """Compare hierarchical ranking with flat ranking on long documents"""
+    from Summarize_Text import rank_document, warm_up
+
+    warm_up(args.language)
+    print(f"Hierarchical benchmark: chunks of {args.chunk_size} sentences, "
+          f"{args.candidates} candidates per chunk")
+    print("=" * 50)
+    for num_sentences in args.lengths:
+        text = generate_text(num_sentences)
+        start = time.perf_counter()
+        flat = rank_document(text, args.language)
+        flat_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        chunked = rank_document(text, args.language, chunk_size=args.chunk_size,
+                                candidates=args.candidates, jobs=args.jobs)
+        chunked_time = time.perf_counter() - start
+
+        # Quality check: share of the flat top-n kept by the hierarchical top-n
+        overlap = len(set(flat.order[:args.num]) & set(chunked.order[:args.num])) / args.num
+        print(f"{num_sentences:>7} sentences: flat {flat_time * 1000:9.1f} ms, "
+              f"hierarchical {chunked_time * 1000:9.1f} ms, top-{args.num} overlap {overlap:.0%}")
+
+# Run in a fresh interpreter per measurement, so each peak RSS is its own
+COMPACT_CHILD = """
+import json, resource, sys, time
+from benchmark import generate_text
+from Summarize_Text import rank_document, warm_up
+num_sentences, language, compact = int(sys.argv[1]), sys.argv[2], sys.argv[3] == '1'
+warm_up(language)
+text = generate_text(num_sentences)
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+document = rank_document(text, language, compact=compact)
+elapsed = time.perf_counter() - start
+print(json.dumps({'baseline_kib': baseline, 'peak_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                  'seconds': elapsed, 'order': document.order}))
+"""
+
+def benchmark_compact(args):
+    """Compare compact mode with the default pipeline: peak RSS, time and ranking"""
+    import json
+    print("Compact mode benchmark: peak RSS while ranking (above the loaded pipeline)")
+    print("=" * 50)
+    for num_sentences in args.lengths:
+        results = []
+        for compact in ('0', '1'):
+            output = subprocess.run([sys.executable, '-c', COMPACT_CHILD, str(num_sentences),
+                                     args.language, compact], cwd=REPO_DIR,
+                                    check=True, capture_output=True, text=True).stdout
+            results.append(json.loads(output.splitlines()[-1]))
+        default, compact = results
+        overlap = len(set(default['order'][:args.num]) & set(compact['order'][:args.num])) / args.num
+        for name, result in (('default', default), ('compact', compact)):
+            rss = (result['peak_kib'] - result['baseline_kib']) / 1024
+            print(f"{num_sentences:>7} sentences {name:<8} {rss:8.1f} MiB "
+                  f"(peak RSS {result['peak_kib'] / 1024:7.1f} MiB) {result['seconds'] * 1000:9.1f} ms")
+        print(f"{'':>17} top-{args.num} overlap {overlap:.0%}")
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a sorted list"""
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+def benchmark_load(args):
+    """Load-test a running server: latency percentiles and throughput of POST /summarize"""
+    import json
+    import urllib.error
+    import urllib.request
+    from collections import Counter
+    from concurrent.futures import ThreadPoolExecutor
+
+    # A few distinct documents, so the server's cache does not serve everything
+    bodies = [json.dumps({'text': text, 'sentences': args.num, 'language': args.language}).encode()
+              for text in generate_corpus(args.distinct, args.sentences)]
+
+    def send(index):
+        request = urllib.request.Request(args.url, data=bodies[index % len(bodies)],
+                                         headers={'Content-Type': 'application/json'})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=args.timeout) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except OSError:
+            status = 'error'
+        return status, time.perf_counter() - start
+
+    print(f"Load test: {args.requests} requests to {args.url}, {args.concurrency} concurrent")
+    print("=" * 50)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(send, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    statuses = Counter(status for status, _ in results)
+    latencies = sorted(latency for status, latency in results if status == 200)
+    print(f"Throughput:   {len(results) / elapsed:.1f} requests/s "
+          f"({len(latencies) / elapsed:.1f} successful/s)")
+    print("Status codes: " + ", ".join(f"{status}: {count}" for status, count in statuses.items()))
+    if latencies:
+        print(f"Latency p50:  {percentile(latencies, 0.50) * 1000:.1f} ms")
+        print(f"Latency p99:  {percentile(latencies, 0.99) * 1000:.1f} ms")
+
+def import_times(statement):
+    """
+    Run statement in a fresh interpreter with -X importtime.
+
+    Returns {module: cumulative microseconds} for the modules imported
+    directly by the statement or by a module outside the standard import
+    chain (i.e. the top level of the importtime tree).
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            cwd=REPO_DIR, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        # Nested imports are indented by two extra spaces per level
+        if not name[1:].startswith(' '):
+            times[name.strip()] = int(cumulative_us)
+    return times
+
+def benchmark_import(args):
+    """Report the cost of importing Summarize_Text versus warming up the full pipeline"""
+    print("Startup benchmark (python -X importtime)")
+    print("=" * 50)
+
+    lazy_statement = 'import Summarize_Text'
+    eager_statement = 'import Summarize_Text; Summarize_Text.warm_up()'
+    wall_times = []
+    for statement in (lazy_statement, eager_statement):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', statement], cwd=REPO_DIR, check=True)
+        wall_times.append(time.perf_counter() - start)
+
+    lazy = import_times(lazy_statement)
+    eager = import_times(eager_statement)
+    deferred = sum(us for name, us in eager.items() if name not in lazy)
+    print(f"import Summarize_Text:         {lazy['Summarize_Text'] / 1000:8.1f} ms "
+          f"(process wall time {wall_times[0] * 1000:.0f} ms)")
+    print(f"deferred until first summary:  {deferred / 1000:8.1f} ms "
+          f"(process wall time with warm_up() {wall_times[1] * 1000:.0f} ms)")
+
+    print(f"\nSlowest imports once the pipeline is loaded (top {args.top}):")
+    for us, name in sorted(((us, name) for name, us in eager.items()), reverse=True)[:args.top]:
+        marker = '' if name in lazy else '  (deferred)'
+        print(f"  {us / 1000:8.1f} ms  {name}{marker}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Text Summarizer benchmarks')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    batch = subparsers.add_parser('batch', help='summarize_many vs summarize_text loop')
+    batch.add_argument('--docs', type=int, default=500, help='Number of documents (default: 500)')
+    batch.add_argument('--sentences', type=int, default=25,
+                       help='Sentences per document (default: 25)')
+    batch.add_argument('-n', '--num', type=int, default=3, help='Summary sentences (default: 3)')
+    batch.add_argument('-l', '--language', help='Language code (auto-detect if not specified)')
+    batch.add_argument('--batch-size', type=int, default=64, help='summarize_many batch size')
+    batch.set_defaults(func=benchmark_batch)
+
+    hierarchical = subparsers.add_parser('hierarchical',
+                                         help='Hierarchical vs flat ranking of long documents')
+    hierarchical.add_argument('--lengths', type=int, nargs='+', default=[1000, 2000, 5000],
+                              help='Document lengths in sentences (default: 1000 2000 5000)')
+    hierarchical.add_argument('--chunk-size', type=int, default=200,
+                              help='Sentences per chunk (default: 200)')
+    hierarchical.add_argument('--candidates', type=int, default=10,
+                              help='Sentences kept from each chunk (default: 10)')
+    hierarchical.add_argument('-j', '--jobs', type=int, default=1,
+                              help='Worker processes for the chunks (default: 1)')
+    hierarchical.add_argument('-n', '--num', type=int, default=10,
+                              help='Summary sentences compared (default: 10)')
+    hierarchical.add_argument('-l', '--language', default='en', help='Language code (default: en)')
+    hierarchical.set_defaults(func=benchmark_hierarchical)
+
+    compact = subparsers.add_parser('compact', help='Peak RSS and ranking of compact mode')
+    compact.add_argument('--lengths', type=int, nargs='+', default=[1000, 4000, 8000],
+                         help='Document lengths in sentences (default: 1000 4000 8000)')
+    compact.add_argument('-n', '--num', type=int, default=10,
+                         help='Summary sentences compared (default: 10)')
+    compact.add_argument('-l', '--language', default='en', help='Language code (default: en)')
+    compact.set_defaults(func=benchmark_compact)
+
+    load = subparsers.add_parser('load', help='Load-test a running server (p50/p99 latency, requests/s)')
+    load.add_argument('--url', default='http://127.0.0.1:8000/summarize',
+                      help='Summarize endpoint (default: http://127.0.0.1:8000/summarize)')
+    load.add_argument('--requests', type=int, default=500, help='Number of requests (default: 500)')
+    load.add_argument('-c', '--concurrency', type=int, default=16,
+                      help='Concurrent clients (default: 16)')
+    load.add_argument('--distinct', type=int, default=50,
+                      help='Distinct documents sent, to limit cache hits (default: 50)')
+    load.add_argument('--sentences', type=int, default=40,
+                      help='Sentences per document (default: 40)')
+    load.add_argument('-n', '--num', type=int, default=3, help='Summary sentences (default: 3)')
+    load.add_argument('-l', '--language', default='en', help='Language code (default: en)')
+    load.add_argument('--timeout', type=float, default=60, help='Client timeout in seconds')
+    load.set_defaults(func=benchmark_load)
+
+    suite = subparsers.add_parser('suite', help='Per-stage timings, scaling and peak memory')
+    suite.add_argument('--languages', nargs='+', default=SUITE_LANGUAGES,
+                       help="Language codes, or 'all' (default: one per script family)")
+    suite.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000],
+                       help='Document sizes in sentences (default: 10 100 1000 10000)')
+    suite.add_argument('--repeat', type=int, default=3, help='Runs per measurement (default: 3)')
+    suite.add_argument('-o', '--output', help='Save the results as JSON')
+    suite.add_argument('--baseline', help='JSON results of an earlier run to compare against')
+    suite.add_argument('--tolerance', type=float, default=0.2,
+                       help='Slowdown flagged as a regression (default: 0.2 = 20%%)')
+    suite.add_argument('--min-ms', type=float, default=1.0,
+                       help='Ignore slowdowns smaller than this many ms (default: 1.0)')
+    suite.set_defaults(func=benchmark_suite)
+
+    startup = subparsers.add_parser('import', help='Import time of Summarize_Text (cold start)')
+    startup.add_argument('--top', type=int, default=10, help='Number of modules to list (default: 10)')
+    startup.set_defaults(func=benchmark_import)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -4,30 +4,272 @@ Command-line interface for the Text Summarizer
 """
 
 import argparse
+import fnmatch
+import glob
+import json
+import os
+import socket
 import sys
-from Summarize_Text import summarize_text, detect_language, LANGUAGE_MAPPINGS
+import time
+from contextlib import nullcontext
+from functools import partial
+from Summarize_Text import (summarize_text, summarize_topics, detect_language, create_worker_pool,
+                            bounded_map, warm_up, LANGUAGE_MAPPINGS)
+from pdf_ingest import extract_pdf_text
+from profiling import Profile
+from idf_model import load_for_language
+from streaming import summarize_stream
+
+def read_text(path, pages=None, jobs=None):
+    """Read the text of an input file ('-' is stdin); PDFs are extracted page by page"""
+    if path == '-':
+        return sys.stdin.read()
+    if path.lower().endswith('.pdf'):
+        return extract_pdf_text(path, pages, jobs)
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def read_file(path, pages=None, jobs=None):
+    """Read an input file, exiting with an error message if it cannot be read"""
+    try:
+        return read_text(path, pages, jobs)
+    except FileNotFoundError:
+        print(f"Error: File '{path}' not found.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        sys.exit(1)
+
+def iter_input_paths(args):
+    """
+    Yield every input file named on the command line.
+
+    Paths may be files, directories (searched recursively for --pattern) or
+    glob patterns, and --from-list adds a newline-delimited list of paths
+    read from a file or from stdin ('-'). Directories and lists are read
+    lazily, one path at a time, so huge corpora are never listed in memory
+    all at once; the matches of a glob pattern are sorted, so those of one
+    pattern are collected first.
+    """
+    for path in (args.file or []) + args.paths:
+        if any(char in path for char in '*?['):
+            yield from sorted(glob.iglob(path, recursive=True))
+        elif os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(fnmatch.filter(files, args.pattern)):
+                    yield os.path.join(root, name)
+        else:
+            yield path
+    
+    if args.from_list:
+        stream = sys.stdin if args.from_list == '-' else open(args.from_list, encoding='utf-8')
+        with stream:
+            for line in stream:
+                if line.strip():
+                    yield line.strip()
+
+def format_topics(topics):
+    """Render summarize_topics output as numbered sections"""
+    return "\n\n".join(f"{i}. {heading}\n" + "-" * 40 + f"\n{summary}"
+                       for i, (heading, summary) in enumerate(topics, 1))
+
+def summarize_document(path, num_sentences=5, language=None, pages=None, chunk_size=None,
+                       topics=False, idf_models=None, compact=False, dedup=False,
+                       candidates=None):
+    """Read and summarize one file, returning a JSON-serialisable record"""
+    record = {'path': path}
+    try:
+        start = time.perf_counter()
+        text = read_text(path, pages)
+        read_done = time.perf_counter()
+        record['language'] = language or detect_language(text)
+        detect_done = time.perf_counter()
+        sections = summarize_topics(text, num_sentences, record['language']) if topics else []
+        if sections:
+            record['topics'] = [{'heading': heading, 'summary': summary}
+                                for heading, summary in sections]
+            record['summary'] = format_topics(sections)
+        else:
+            idf_model = load_for_language(idf_models, record['language']) if idf_models else None
+            summary = summarize_text(text, num_sentences, record['language'],
+                                     chunk_size=chunk_size, idf_model=idf_model,
+                                     compact=compact, dedup=dedup, candidates=candidates)
+            # A failed summary is reported as an error, not as the summary text
+            if summary.error:
+                record['error'] = str(summary)
+                return record
+            record['summary'] = summary
+        summarize_done = time.perf_counter()
+        record['timings'] = {
+            'read_ms': round((read_done - start) * 1000, 2),
+            'detect_ms': round((detect_done - read_done) * 1000, 2),
+            'summarize_ms': round((summarize_done - detect_done) * 1000, 2),
+        }
+    except Exception as e:
+        record['error'] = str(e)
+    return record
+
+def summarize_files(args):
+    """
+    Summarize many files in one process, streaming one result per file.
+
+    Files are read and summarized by args.jobs pre-warmed worker processes
+    with a bounded number in flight, and each result is written as soon as
+    it is ready, either as a JSON line (--jsonl) or as a text section.
+    """
+    summarize = partial(summarize_document, num_sentences=args.sentences, language=args.language,
+                        pages=args.pages, chunk_size=args.chunk_size, topics=args.topics,
+                        idf_models=args.idf_model, compact=args.compact, dedup=args.dedup,
+                        candidates=args.candidates)
+    paths = iter_input_paths(args)
+    
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    count = 0
+    try:
+        if args.jobs > 1:
+            with create_worker_pool(args.jobs, args.language) as executor:
+                for record in bounded_map(executor, summarize, paths, 4 * args.jobs):
+                    write_record(out, record, args.jsonl)
+                    count += 1
+        else:
+            for record in map(summarize, paths):
+                write_record(out, record, args.jsonl)
+                count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    
+    print(f"Summarized {count} document(s)" + (f" to '{args.output}'" if args.output else ""),
+          file=sys.stderr)
+
+def write_record(out, record, jsonl=False):
+    """Write one summarize_document result to the output stream"""
+    if jsonl:
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    else:
+        if 'error' in record:
+            error = record['error']
+            body = error if error.startswith('Error') else f"Error: {error}"
+        else:
+            body = record['summary']
+        out.write("=" * 50 + f"\nSUMMARY: {record['path']}\n" + "=" * 50 + f"\n{body}\n\n")
+    out.flush()
+
+def open_stream(source):
+    """Lines of a continuous feed: '-' is stdin, HOST:PORT a TCP connection"""
+    if source == '-':
+        return iter(sys.stdin.readline, '')
+    host, port = source.rsplit(':', 1)
+    connection = socket.create_connection((host, int(port)))
+    return iter(connection.makefile('r', encoding='utf-8', errors='replace').readline, '')
+
+def stream_summaries(args):
+    """
+    Summarize a continuous feed, writing an updated summary of the last
+    --window sentences every --every sentences or --interval seconds.
+    """
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for seen, summary in summarize_stream(open_stream(args.stream), args.sentences,
+                                              args.language, args.window, args.every,
+                                              args.interval):
+            if args.jsonl:
+                out.write(json.dumps({'sentences_seen': seen, 'language': summary.language,
+                                      'summary': summary}, ensure_ascii=False) + "\n")
+            else:
+                out.write("=" * 50 + f"\nSUMMARY after {seen} sentences\n" + "=" * 50 +
+                          f"\n{summary}\n\n")
+            out.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if out is not sys.stdout:
+            out.close()
 
 def main():
     parser = argparse.ArgumentParser(description='Text Summarizer CLI')
-    parser.add_argument('-f', '--file', help='Input text file path')
+    parser.add_argument('paths', nargs='*',
+                       help='Input files, directories or glob patterns to summarize in batch')
+    parser.add_argument('-f', '--file', nargs='+', help='Input text file path(s)')
     parser.add_argument('-n', '--sentences', type=int, default=5, 
                        help='Number of sentences in summary (default: 5)')
     parser.add_argument('-l', '--language', help='Language code (auto-detect if not specified)')
     parser.add_argument('-o', '--output', help='Output file path (optional)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                       help='Worker processes used for several files or PDF pages (default: 1)')
+    parser.add_argument('--from-list', metavar='FILE',
+                       help="Newline-delimited list of input paths ('-' reads it from stdin)")
+    parser.add_argument('--pattern', default='*.txt',
+                       help='File name pattern used when searching directories (default: *.txt)')
+    parser.add_argument('--pages',
+                       help='Pages of PDF inputs to summarize, e.g. "1-5,8,10-" (default: all)')
+    parser.add_argument('--jsonl', action='store_true',
+                       help='Write one JSON line per document (path, language, summary or error, '
+                            'timings); without input paths, the text on stdin is the document')
+    parser.add_argument('--chunk-size', type=int, metavar='SENTENCES',
+                       help='Summarize documents longer than this many sentences hierarchically, '
+                            'chunk by chunk (e.g. 200)')
+    parser.add_argument('--candidates', type=int, metavar='N',
+                       help='With --chunk-size, the least sentences each chunk keeps for the final '
+                            'ranking; more is slower but closer to ranking the whole document '
+                            '(default: 10 or --sentences, whichever is larger)')
+    parser.add_argument('--topics', action='store_true',
+                       help='Summarize each section (heading) of the text separately')
+    parser.add_argument('--stream', nargs='?', const='-', metavar='SOURCE',
+                       help="Summarize a continuous feed from stdin ('-', the default) or "
+                            "HOST:PORT, printing updated summaries as it goes")
+    parser.add_argument('--window', type=int, default=500,
+                       help='Sentences kept in the rolling window of --stream (default: 500)')
+    parser.add_argument('--every', type=int, default=50,
+                       help='Emit a summary every this many sentences with --stream (default: 50)')
+    parser.add_argument('--interval', type=float,
+                       help='Also emit a summary when this many seconds have passed (--stream)')
+    parser.add_argument('--idf-model', metavar='DIR',
+                       help='Weight terms with the pre-fitted IDF model of the text\'s language '
+                            'found in DIR (built with "idf_model.py build")')
+    parser.add_argument('--compact', action='store_true',
+                       help='Low-memory mode: hashed TF-IDF and float32 similarities '
+                            '(about half the peak memory on long documents)')
+    parser.add_argument('--dedup', action='store_true',
+                       help='Collapse near-duplicate sentences (page headers, footers, repeated '
+                            'disclaimers) before ranking')
+    parser.add_argument('--profile', nargs='?', const='summarize.prof', metavar='PATH',
+                       help='Profile the run (cProfile and tracemalloc), write the profile to PATH '
+                            '(default: summarize.prof) and print the hottest functions per stage')
+    parser.add_argument('--profile-top', type=int, default=15, metavar='N',
+                       help='Functions listed in the --profile report (default: 15)')
     
     args = parser.parse_args()
     
+    if args.stream:
+        stream_summaries(args)
+        return
+    
+    # Only this process is profiled: with --jobs, work done in the worker
+    # processes shows up as waiting on them. Imports and NLTK data are loaded
+    # first, so the report shows the pipeline rather than cold-start costs.
+    if args.profile:
+        warm_up(args.language)
+    profile = Profile(args.profile_top) if args.profile else nullcontext()
+    with profile:
+        run(args)
+    if args.profile:
+        print(profile.report(), file=sys.stderr)
+        print(f"Profile saved to '{profile.dump(args.profile)}'", file=sys.stderr)
+
+def run(args):
+    """Summarize the files or text named by the parsed command line"""
+    if args.jsonl and not (args.paths or args.from_list or args.file):
+        # The text piped on stdin is the one document, read in this process
+        args.paths, args.jobs = ['-'], 1
+    if args.paths or args.from_list or args.jsonl or (args.file and len(args.file) > 1):
+        summarize_files(args)
+        return
+    
     # Get input text
     if args.file:
-        try:
-            with open(args.file, 'r', encoding='utf-8') as f:
-                text = f.read()
-        except FileNotFoundError:
-            print(f"Error: File '{args.file}' not found.")
-            sys.exit(1)
-        except Exception as e:
-            print(f"Error reading file: {e}")
-            sys.exit(1)
+        text = read_file(args.file[0], args.pages, args.jobs)
     else:
         print("Enter your text (press Ctrl+Z then Enter on Windows, or Ctrl+D on Unix to finish):")
         text = sys.stdin.read()
@@ -36,15 +278,26 @@ def main():
         print("Error: No text provided.")
         sys.exit(1)
     
-    # Detect or use specified language
-    language = args.language if args.language else None
-    detected_lang = detect_language(text) if language is None else language
+    # Detect or use specified language, once: the result is passed on to
+    # summarize_text so it does not detect the language again
+    detected_lang = args.language if args.language else detect_language(text)
     lang_name = LANGUAGE_MAPPINGS.get(detected_lang, detected_lang)
     print(f"Detected/Using language: {lang_name}")
     
     # Generate summary
     print("Generating summary...")
-    summary = summarize_text(text, args.sentences, language)
+    topics = summarize_topics(text, args.sentences, detected_lang, jobs=args.jobs) if args.topics else []
+    if topics:
+        summary = format_topics(topics)
+    else:
+        if args.topics:
+            print("No clear topics found. Using normal summarization.")
+        idf_model = load_for_language(args.idf_model, detected_lang) if args.idf_model else None
+        if args.idf_model and idf_model is None:
+            print(f"No IDF model for {lang_name} in '{args.idf_model}'; using the text's own.")
+        summary = summarize_text(text, args.sentences, detected_lang, chunk_size=args.chunk_size,
+                                 jobs=args.jobs, idf_model=idf_model, compact=args.compact,
+                                 dedup=args.dedup, candidates=args.candidates)
     
     # Output summary
     if args.output:
@@ -0,0 +1,104 @@
+"""
+Near-duplicate sentence detection with MinHash signatures and LSH banding
+"""
+
+import zlib
+
+# Signature length and LSH bands: 12 bands of 6 rows catch 97% of the pairs
+# with Jaccard similarity 0.8 and under 0.1% of those at 0.2
+NUM_PERM = 72
+BANDS = 12
+
+def shingles(tokens):
+    """A sentence's words and word pairs, hashed to 32 bits"""
+    grams = set(tokens)
+    grams.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+    return {zlib.crc32(gram.encode('utf-8')) for gram in grams}
+
+def minhash_signatures(shingle_sets, num_perm=NUM_PERM, seed=0):
+    """
+    MinHash signature (num_perm minimums) of every non-empty shingle set.
+
+    Each permutation is a multiply-shift hash of the 32-bit shingle hashes,
+    applied to all shingles of all sentences at once, so the cost is linear
+    in the total number of shingles.
+    """
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    offsets = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+    sizes = np.array([len(shingle_set) for shingle_set in shingle_sets])
+    values = np.fromiter((value for shingle_set in shingle_sets for value in shingle_set),
+                         dtype=np.uint64, count=int(sizes.sum()))
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    signatures = np.empty((len(shingle_sets), num_perm), dtype=np.uint64)
+    for i in range(num_perm):
+        hashed = (multipliers[i] * values + offsets[i]) >> np.uint64(32)
+        signatures[:, i] = np.minimum.reduceat(hashed, starts)
+    return signatures
+
+def _jaccard(first, second):
+    return len(first & second) / len(first | second)
+
+def near_duplicates(token_lists, threshold=0.8, num_perm=NUM_PERM, bands=BANDS):
+    """
+    For each sentence (a non-empty token list), the index of the first
+    sentence it is a near-duplicate of, or its own index.
+
+    Sentences whose signatures agree on a whole band become candidates, and
+    candidates are merged when the Jaccard similarity of their shingles is at
+    least threshold. Only sentences sharing a bucket are ever compared, so
+    the work stays close to linear instead of comparing every pair.
+    """
+    import numpy as np
+    parent = list(range(len(token_lists)))
+    if len(token_lists) < 2:
+        return parent
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    shingle_sets = [shingles(tokens) for tokens in token_lists]
+    signatures = minhash_signatures(shingle_sets, num_perm)
+    rows = num_perm // bands
+    for band in range(bands):
+        # Fold the band's rows into one key per sentence; a key collision only
+        # costs a Jaccard comparison
+        keys = signatures[:, band * rows].copy()
+        for row in range(band * rows + 1, (band + 1) * rows):
+            keys = keys * np.uint64(0x100000001B3) ^ signatures[:, row]
+        order = np.argsort(keys, kind='stable')
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(keys[order])) + 1, [len(keys)]])
+        shared = np.flatnonzero(np.diff(starts) > 1)
+        for start, stop in zip(starts[shared].tolist(), starts[shared + 1].tolist()):
+            members = order[start:stop].tolist()
+            # Distinct sentences in the bucket; each member joins the first it matches
+            distinct = [members[0]]
+            for member in members[1:]:
+                for other in distinct:
+                    root, other_root = find(member), find(other)
+                    if root == other_root or _jaccard(shingle_sets[member],
+                                                      shingle_sets[other]) >= threshold:
+                        parent[max(root, other_root)] = min(root, other_root)
+                        break
+                else:
+                    distinct.append(member)
+    return [find(i) for i in range(len(parent))]
+
+def collapse_near_duplicates(kept, token_lists, threshold=0.8):
+    """
+    Keep the first sentence of each group of near-duplicates.
+
+    kept holds the positions of the sentences with content and token_lists
+    the tokens of every sentence. Returns the positions that remain and the
+    multiplicity of each: how many sentences of the text it stands for.
+    """
+    groups = near_duplicates([token_lists[i] for i in kept], threshold)
+    multiplicity = [0] * len(kept)
+    for group in groups:
+        multiplicity[group] += 1
+    remaining = [j for j, group in enumerate(groups) if group == j]
+    return [kept[j] for j in remaining], [multiplicity[j] for j in remaining]
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Pre-fitted IDF models: term weights learned offline from a corpus
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import sys
+from collections import Counter
+from functools import lru_cache, partial
+from Summarize_Text import (detect_language, multilingual_tokenize, tokenize_sentences,
+                            create_worker_pool, bounded_map)
+
+def term_hashes(terms):
+    """Stable 64-bit hashes of terms, as a numpy array"""
+    import numpy as np
+    digests = b"".join(hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest()
+                       for term in terms)
+    return np.frombuffer(digests, dtype='<u8')
+
+class IdfModel:
+    """
+    Inverse document frequencies of a language's terms, fitted on a corpus.
+
+    Sentences are the documents, as in the per-text vectorizer, and the
+    weights follow the same smooth IDF formula. The vocabulary is stored as
+    sorted 64-bit term hashes next to their IDF, two flat arrays that load()
+    memory-maps: opening a model is instant, its pages are shared by every
+    process using it, and only the terms a text contains are looked up.
+
+    transform() vectorizes sentences without fitting anything. Terms the
+    corpus never had (or had fewer than min_df times) get the IDF of a term
+    seen in no sentence, the highest there is.
+    """
+
+    def __init__(self, hashes, idf, info, path=None):
+        self.hashes = hashes
+        self.idf = idf
+        self.info = info
+        self.path = path
+        self.language = info['language']
+        self.unseen_idf = self.smooth_idf(info['sentences'], 0)
+
+    @staticmethod
+    def smooth_idf(sentences, doc_freq):
+        import numpy as np
+        return np.log((1.0 + sentences) / (1.0 + doc_freq)) + 1.0
+
+    @classmethod
+    def fit(cls, doc_freq, sentences, language, min_df=2, documents=None):
+        """Model from a term -> number of sentences Counter"""
+        import numpy as np
+        terms = [term for term, count in doc_freq.items() if count >= min_df]
+        hashes = term_hashes(terms)
+        idf = cls.smooth_idf(sentences, np.array([doc_freq[term] for term in terms], dtype=float))
+        # A hash collision keeps one of the terms; at 64 bits that is ~1e-8 for a million terms
+        hashes, first = np.unique(hashes, return_index=True)
+        info = {'language': language, 'sentences': sentences, 'documents': documents,
+                'terms': len(hashes), 'min_df': min_df}
+        return cls(hashes, idf[first], info)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map the model saved in the directory path"""
+        import numpy as np
+        with open(os.path.join(path, 'model.json'), encoding='utf-8') as f:
+            info = json.load(f)
+        return cls(np.load(os.path.join(path, 'hashes.npy'), mmap_mode='r'),
+                   np.load(os.path.join(path, 'idf.npy'), mmap_mode='r'), info, path)
+
+    def save(self, path):
+        import numpy as np
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, 'hashes.npy'), np.asarray(self.hashes))
+        np.save(os.path.join(path, 'idf.npy'), np.asarray(self.idf))
+        with open(os.path.join(path, 'model.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.info, f, indent=2)
+        self.path = path
+        return path
+
+    def __reduce__(self):
+        # Worker processes map the saved files again instead of receiving a copy
+        if self.path is not None:
+            return (IdfModel.load, (self.path,))
+        import numpy as np
+        return (IdfModel, (np.asarray(self.hashes), np.asarray(self.idf), self.info))
+
+    def weights(self, terms):
+        """IDF of each term"""
+        import numpy as np
+        hashes = term_hashes(terms)
+        if not len(self.hashes):
+            return np.full(len(hashes), self.unseen_idf)
+        positions = np.minimum(np.searchsorted(self.hashes, hashes), len(self.hashes) - 1)
+        found = self.hashes[positions] == hashes
+        return np.where(found, self.idf[positions], self.unseen_idf)
+
+    def transform(self, token_lists):
+        """L2-normalised TF-IDF rows of the given sentences (lists of tokens)"""
+        import numpy as np
+        from scipy import sparse
+        from sklearn.preprocessing import normalize
+        vocabulary = {}
+        columns, indptr = [], [0]
+        for tokens in token_lists:
+            columns.extend(vocabulary.setdefault(token, len(vocabulary)) for token in tokens)
+            indptr.append(len(columns))
+        counts = sparse.csr_matrix(
+            (np.ones(len(columns)), np.array(columns, dtype=np.int64), np.array(indptr)),
+            shape=(len(indptr) - 1, max(len(vocabulary), 1)),
+        )
+        counts.sum_duplicates()
+        counts.data *= self.weights(list(vocabulary))[counts.indices]
+        return normalize(counts)
+
+@lru_cache(maxsize=None)
+def load_for_language(models_dir, language):
+    """The model of language under models_dir, or None if there is none"""
+    path = os.path.join(models_dir, language)
+    if not os.path.exists(os.path.join(path, 'model.json')):
+        return None
+    return IdfModel.load(path)
+
+def read_document(path):
+    if path.lower().endswith('.pdf'):
+        from pdf_ingest import extract_pdf_text
+        return extract_pdf_text(path)
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+def document_frequencies(path, language=None):
+    """(language, sentences with content, term -> sentences containing it) of one file"""
+    text = read_document(path)
+    if not text.strip():
+        return None, 0, Counter()
+    language = language or detect_language(text)
+    token_lists = tokenize_sentences(text, multilingual_tokenize(text, language), language)
+    doc_freq = Counter()
+    sentences = 0
+    for tokens in token_lists:
+        if tokens:
+            doc_freq.update(set(tokens))
+            sentences += 1
+    return language, sentences, doc_freq
+
+def iter_corpus(directory, pattern='*.txt'):
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(fnmatch.filter(files, pattern)):
+            yield os.path.join(root, name)
+
+def build_models(directory, output, language=None, pattern='*.txt', min_df=2, jobs=1):
+    """
+    Fit one IdfModel per language from the files under directory and save
+    each to output/<language>. Returns the saved models.
+    """
+    counts = {}
+    frequencies = partial(document_frequencies, language=language)
+    paths = iter_corpus(directory, pattern)
+    if jobs > 1:
+        executor = create_worker_pool(jobs, language)
+        results = bounded_map(executor, frequencies, paths, 4 * jobs)
+    else:
+        executor = None
+        results = map(frequencies, paths)
+    try:
+        for lang_code, sentences, doc_freq in results:
+            if not sentences:
+                continue
+            total = counts.setdefault(lang_code, [0, 0, Counter()])
+            total[0] += 1
+            total[1] += sentences
+            total[2].update(doc_freq)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    models = []
+    for lang_code, (documents, sentences, doc_freq) in sorted(counts.items()):
+        model = IdfModel.fit(doc_freq, sentences, lang_code, min_df, documents)
+        model.save(os.path.join(output, lang_code))
+        models.append(model)
+    return models
+
+def main():
+    parser = argparse.ArgumentParser(description='Pre-fitted IDF models for the Text Summarizer')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help='Fit per-language IDF models from a directory of text')
+    build.add_argument('directory', help='Corpus directory, searched recursively')
+    build.add_argument('-o', '--output', default='idf_models',
+                       help='Directory the models are saved to, one per language (default: idf_models)')
+    build.add_argument('-l', '--language', help='Language code of every file (auto-detect per file if not specified)')
+    build.add_argument('--pattern', default='*.txt',
+                       help='File name pattern of the corpus files (default: *.txt)')
+    build.add_argument('--min-df', type=int, default=2,
+                       help='Drop terms found in fewer sentences than this (default: 2)')
+    build.add_argument('-j', '--jobs', type=int, default=1, help='Worker processes (default: 1)')
+
+    args = parser.parse_args()
+    if not os.path.isdir(args.directory):
+        print(f"Error: Directory '{args.directory}' not found.")
+        sys.exit(1)
+    models = build_models(args.directory, args.output, args.language, args.pattern, args.min_df,
+                          args.jobs)
+    if not models:
+        print("Error: No text found to build a model from.")
+        sys.exit(1)
+    for model in models:
+        info = model.info
+        print(f"{info['language']}: {info['terms']} terms from {info['sentences']} sentences "
+              f"in {info['documents']} document(s) -> {model.path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Incremental summarization of documents that grow or change over time
+"""
+
+import bisect
+import math
+from collections import Counter, defaultdict
+from Summarize_Text import (detect_language, multilingual_tokenize, tokenize_sentences,
+                            build_similarity_graph, pagerank, _batch_tfidf, RankingError,
+                            RankedDocument, Summary, SummarizationError)
+
+# Texts are compared this many characters at a time when looking for the edit
+_COMPARE_CHUNK = 4096
+
+def _common_prefix_length(a, b):
+    limit = min(len(a), len(b))
+    i = 0
+    while i + _COMPARE_CHUNK <= limit and a[i:i + _COMPARE_CHUNK] == b[i:i + _COMPARE_CHUNK]:
+        i += _COMPARE_CHUNK
+    while i < limit and a[i] == b[i]:
+        i += 1
+    return i
+
+def _common_suffix_length(a, b, limit):
+    i = 0
+    while (i + _COMPARE_CHUNK <= limit and
+           a[len(a) - i - _COMPARE_CHUNK:len(a) - i] == b[len(b) - i - _COMPARE_CHUNK:len(b) - i]):
+        i += _COMPARE_CHUNK
+    while i < limit and a[len(a) - i - 1] == b[len(b) - i - 1]:
+        i += 1
+    return i
+
+class IncrementalSummarizer:
+    """
+    Summarizes a live document (a transcript, a log...) across updates.
+
+    The summarizer keeps the sentence list, each sentence's term counts, the
+    document frequency of every term and the similarity matrix between
+    update() and append() calls. An update only tokenizes the sentences
+    around the edit, computes the similarities of the new sentences (through
+    an inverted index, so only sentences sharing a term are visited) and
+    warm-starts PageRank from the previous scores.
+
+    Similarities already in the graph keep the IDF weights they were computed
+    with. Once the sentences changed since the last full build reach
+    (rebuild_ratio - 1) times the document size, everything is rebuilt with
+    current weights. The rebuild cost is amortised over the updates, and
+    right after a rebuild the ranking equals that of rank_document.
+    """
+
+    def __init__(self, language=None, rebuild_ratio=2.0):
+        self.language = language
+        self.rebuild_ratio = rebuild_ratio
+        self.text = ""
+        # Per sentence, in document order
+        self._sentences = []
+        self._starts = []
+        self._tokens = []
+        self._slots = []  # row of the sentence in the similarity matrix, None if it has no tokens
+        # Per similarity matrix slot
+        self._counts = []
+        self._scores = []
+        self._free = []
+        self._postings = defaultdict(dict)  # term -> {slot: count}
+        self._sim = None
+        self._changed = 0
+        self._built_size = 0
+        self._cold_start = True
+        self._document = None
+
+    def append(self, text):
+        """Add text at the end of the document"""
+        self.update(self.text + text)
+
+    def update(self, text):
+        """
+        Replace the document with a new version of it.
+
+        Only the sentences touching the region where the old and new texts
+        differ are tokenized again; the rest keep their state.
+        """
+        old = self.text
+        if text == old:
+            return
+        if self.language is None:
+            self.language = detect_language(text)
+
+        prefix = _common_prefix_length(old, text)
+        suffix = _common_suffix_length(old, text, min(len(old), len(text)) - prefix)
+        # The edited sentences, plus one on each side since a boundary can move
+        first = max(0, bisect.bisect_right(self._starts, prefix) - 2)
+        last = min(len(self._sentences), bisect.bisect_left(self._starts, len(old) - suffix) + 1)
+        delta = len(text) - len(old)
+        start = self._starts[first] if first < len(self._starts) else 0
+        end = self._starts[last] + delta if last < len(self._starts) else len(text)
+
+        for slot in self._slots[first:last]:
+            if slot is not None:
+                self._remove_slot(slot)
+
+        segment = text[start:end]
+        sentences = multilingual_tokenize(segment, self.language) if segment.strip() else []
+        token_lists = tokenize_sentences(segment, sentences, self.language)
+        starts, position = [], 0
+        for sentence in sentences:
+            found = segment.find(sentence, position)
+            if found >= 0:
+                position = found + len(sentence)
+            starts.append(start + (found if found >= 0 else position))
+
+        added = [self._add_slot(tokens) if tokens else None for tokens in token_lists]
+        self._sentences[first:last] = sentences
+        self._tokens[first:last] = token_lists
+        self._slots[first:last] = added
+        self._starts[first:last] = starts
+        for i in range(first + len(sentences), len(self._starts)):
+            self._starts[i] += delta
+        self.text = text
+        self._document = None
+
+        new_slots = [slot for slot in added if slot is not None]
+        self._changed += (last - first) + len(new_slots)
+        if self._sim is None or self._changed >= (self.rebuild_ratio - 1) * max(self._built_size, 1):
+            self.rebuild()
+        else:
+            self._grow(max(new_slots, default=-1) + 1)
+            self._add_similarities(new_slots)
+
+    def rebuild(self):
+        """Recompute every similarity with the current IDF weights"""
+        kept = [i for i, tokens in enumerate(self._tokens) if tokens]
+        self._postings = defaultdict(dict)
+        self._counts, self._scores, self._free = [], [], []
+        for i in kept:
+            self._slots[i] = self._add_slot(self._tokens[i])
+        for i, tokens in enumerate(self._tokens):
+            if not tokens:
+                self._slots[i] = None
+        if kept:
+            vectors, _ = _batch_tfidf([[self._tokens[i] for i in kept]])
+            self._sim = build_similarity_graph(vectors)
+        else:
+            self._sim = None
+        self._changed = 0
+        self._built_size = len(kept)
+        self._cold_start = True
+        self._document = None
+
+    def _add_slot(self, tokens):
+        counts = Counter(tokens)
+        if self._free:
+            slot = self._free.pop()
+            self._counts[slot] = counts
+            self._scores[slot] = None
+        else:
+            slot = len(self._counts)
+            self._counts.append(counts)
+            self._scores.append(None)
+        for term, count in counts.items():
+            self._postings[term][slot] = count
+        return slot
+
+    def _remove_slot(self, slot):
+        for term in self._counts[slot]:
+            postings = self._postings[term]
+            del postings[slot]
+            if not postings:
+                del self._postings[term]
+        self._counts[slot] = None
+        self._scores[slot] = None
+        self._free.append(slot)
+        if self._sim is not None and slot < self._sim.shape[0]:
+            self._sim[slot, :] = 0
+            self._sim[:, slot] = 0
+
+    def _grow(self, size):
+        """Make the similarity matrix at least size x size (doubling its capacity)"""
+        import numpy as np
+        capacity = self._sim.shape[0]
+        if size > capacity:
+            grown = np.zeros((max(size, 2 * capacity), max(size, 2 * capacity)))
+            grown[:capacity, :capacity] = self._sim
+            self._sim = grown
+
+    def _add_similarities(self, slots):
+        """Cosine similarities of the given slots with every sentence sharing a term"""
+        import numpy as np
+        num_sentences = sum(counts is not None for counts in self._counts)
+        idf = {}
+        norms = {}
+
+        def weight(term):
+            if term not in idf:
+                idf[term] = math.log((1 + num_sentences) / (1 + len(self._postings[term]))) + 1
+            return idf[term]
+
+        def norm(slot):
+            if slot not in norms:
+                norms[slot] = math.sqrt(sum((count * weight(term)) ** 2
+                                            for term, count in self._counts[slot].items()))
+            return norms[slot]
+
+        for slot in slots:
+            dots = defaultdict(float)
+            for term, count in self._counts[slot].items():
+                term_weight = count * weight(term) ** 2
+                for other, other_count in self._postings[term].items():
+                    dots[other] += term_weight * other_count
+            dots.pop(slot, None)
+            if not dots:
+                continue
+            others = np.fromiter(dots.keys(), dtype=np.int64, count=len(dots))
+            values = np.fromiter(dots.values(), dtype=float, count=len(dots))
+            values /= norm(slot) * np.array([norm(other) for other in others])
+            self._sim[slot, others] = values
+            self._sim[others, slot] = values
+
+    def document(self):
+        """The current RankedDocument; raises SummarizationError like rank_document"""
+        if self._document is None:
+            self._document = self._rank()
+        return self._document
+
+    def summary(self, num_sentences=5, document_order=False):
+        """The current summary, as summarize_text would return it"""
+        try:
+            return self.document().summary(num_sentences, document_order)
+        except SummarizationError as e:
+            return Summary(str(e), e.language, error=True)
+
+    def _rank(self):
+        import numpy as np
+        if not self.text.strip():
+            raise SummarizationError("Error: No text provided.")
+        if len(self._sentences) < 2:
+            raise SummarizationError("Error: Text must contain at least 2 sentences to summarize.",
+                                     self.language)
+        kept = [i for i, slot in enumerate(self._slots) if slot is not None]
+        if len(kept) < 2:
+            raise SummarizationError("Error: Not enough meaningful content to summarize.",
+                                     self.language)
+
+        slots = np.array([self._slots[i] for i in kept])
+        sim_mat = self._sim[np.ix_(slots, slots)]
+        if sim_mat.sum() == 0:
+            # Fallback: keep the original sentence order
+            return RankedDocument(self._sentences, range(len(self._sentences)),
+                                  [0.0] * len(self._sentences), self.language)
+
+        nstart = None
+        if not self._cold_start:
+            previous = [self._scores[slot] for slot in slots]
+            fill = 1.0 / len(kept)
+            nstart = [fill if score is None else score for score in previous]
+        try:
+            scores = pagerank(sim_mat, nstart=nstart)
+        except RankingError:
+            # Fallback: use the sentences' total similarity
+            scores = sim_mat.sum(axis=1)
+        for slot, score in zip(slots, scores):
+            self._scores[slot] = float(score)
+        self._cold_start = False
+
+        ranked = sorted(range(len(kept)), key=lambda j: (scores[j], self._sentences[kept[j]]),
+                        reverse=True)
+        return RankedDocument(self._sentences, [kept[j] for j in ranked],
+                              [scores[j] for j in ranked], self.language)
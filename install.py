@@ -19,7 +19,7 @@ def install_requirements():
             subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements-minimal.txt"])
         except subprocess.CalledProcessError:
             print("Trying individual package installation...")
-            packages = ['nltk', 'scikit-learn', 'networkx', 'numpy', 'PyPDF2', 'langdetect']
+            packages = ['nltk', 'scikit-learn', 'networkx', 'numpy', 'scipy', 'PyPDF2', 'langdetect']
             for pkg in packages:
                 try:
                     subprocess.check_call([sys.executable, "-m", "pip", "install", pkg])
@@ -42,7 +42,7 @@ def install_requirements():
     except Exception as e:
         print(f"[ERROR] Setup error: {e}")
         print("\nTry manual installation:")
-        print("   pip install nltk scikit-learn networkx numpy PyPDF2 langdetect")
+        print("   pip install nltk scikit-learn networkx numpy scipy PyPDF2 langdetect")
         print("   python setup_nltk.py")
 
 if __name__ == "__main__":
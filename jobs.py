@@ -0,0 +1,220 @@
+"""
+Background summarization jobs for large documents
+"""
+
+import json
+import multiprocessing
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from Summarize_Text import rank_document, _init_worker, SummarizationError, LANGUAGE_MAPPINGS
+
+# A job is 'queued', then 'running' (with its current stage), then 'done' or 'failed'
+FINISHED = ('done', 'failed')
+
+class MemoryJobStore:
+    """
+    Keeps jobs in a dict. Finished jobs are evicted ttl seconds after they
+    finish; eviction is done on every create, so it costs O(evicted jobs).
+    """
+
+    def __init__(self, ttl=3600):
+        self.ttl = ttl
+        self._jobs = {}
+        self._finished = deque()  # (finished_at, job_id), oldest first
+        self._lock = threading.Lock()
+
+    def create(self, job_id):
+        with self._lock:
+            self._evict(time.time())
+            self._jobs[job_id] = {'id': job_id, 'status': 'queued', 'stage': None,
+                                  'created': time.time()}
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.update(fields)
+            if fields.get('status') in FINISHED:
+                job['finished'] = time.time()
+                self._finished.append((job['finished'], job_id))
+
+    def get(self, job_id):
+        """Return a copy of the job, or None if it is unknown or expired"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or time.time() - job.get('finished', time.time()) > self.ttl:
+                return None
+            return dict(job)
+
+    def _evict(self, now):
+        while self._finished and now - self._finished[0][0] > self.ttl:
+            self._jobs.pop(self._finished.popleft()[1], None)
+
+class SQLiteJobStore:
+    """
+    Keeps jobs in an SQLite database, so they survive restarts and can be
+    polled from several server processes. Finished jobs are deleted ttl
+    seconds after they finish.
+    """
+
+    def __init__(self, path, ttl=3600):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, data TEXT NOT NULL, "
+            "finished REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished)")
+        self._db.commit()
+
+    def create(self, job_id):
+        now = time.time()
+        job = {'id': job_id, 'status': 'queued', 'stage': None, 'created': now}
+        with self._lock:
+            self._db.execute("DELETE FROM jobs WHERE finished < ?", (now - self.ttl,))
+            self._db.execute("INSERT INTO jobs (id, data) VALUES (?, ?)",
+                             (job_id, json.dumps(job, ensure_ascii=False)))
+            self._db.commit()
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            row = self._db.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return
+            job = json.loads(row[0])
+            job.update(fields)
+            if fields.get('status') in FINISHED:
+                job['finished'] = time.time()
+            self._db.execute("UPDATE jobs SET data = ?, finished = ? WHERE id = ?",
+                             (json.dumps(job, ensure_ascii=False), job.get('finished'), job_id))
+            self._db.commit()
+
+    def get(self, job_id):
+        """Return the job, or None if it is unknown or expired"""
+        with self._lock:
+            row = self._db.execute("SELECT data, finished FROM jobs WHERE id = ?",
+                                   (job_id,)).fetchone()
+        if row is None or (row[1] is not None and time.time() - row[1] > self.ttl):
+            return None
+        return json.loads(row[0])
+
+# Progress queue of a job worker process (set by _init_job_worker)
+_progress_events = None
+
+def _init_job_worker(events, language=None):
+    global _progress_events
+    _progress_events = events
+    _init_worker(language)
+
+def _run_job(job_id, text, num_sentences, language, options):
+    """Summarize one document in a worker process, reporting each stage"""
+    def progress(stage):
+        _progress_events.put((job_id, stage))
+
+    try:
+        document = rank_document(text, language, progress=progress, **options)
+    except SummarizationError as e:
+        return {'status': 'failed', 'error': str(e), 'detected_language': e.language}
+    return {
+        'status': 'done',
+        'result': {
+            'summary': document.summary(num_sentences),
+            'detected_language': document.language,
+            'language_name': LANGUAGE_MAPPINGS.get(document.language, document.language),
+        },
+    }
+
+class JobManager:
+    """
+    Runs summarization jobs in a pool of worker processes.
+
+    submit returns a job id immediately; the job's status, current stage
+    and result are then read from the store. Workers report stages through
+    a queue that a background thread copies into the store, so any store
+    works, including one that only lives in this process.
+    """
+
+    def __init__(self, store=None, jobs=1, language=None):
+        self.store = store if store is not None else MemoryJobStore()
+        context = multiprocessing.get_context()
+        self._context = context
+        self._jobs = jobs
+        self._language = language
+        self._events = context.Queue()
+        self._lock = threading.Lock()
+        self._executor = self._create_executor()
+        threading.Thread(target=self._copy_progress, daemon=True).start()
+
+    def _create_executor(self):
+        return ProcessPoolExecutor(max_workers=self._jobs, mp_context=self._context,
+                                   initializer=_init_job_worker,
+                                   initargs=(self._events, self._language))
+
+    def submit(self, text, num_sentences=5, language=None, **options):
+        """
+        Queue a document for summarization and return its job id.
+
+        A pool broken by a dead worker is replaced and the submission tried
+        once more; if that fails too, the job is marked failed before the
+        error is raised, so it is not left queued forever.
+        """
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id)
+        args = (_run_job, job_id, text, num_sentences, language, options)
+        executor = self._executor
+        try:
+            try:
+                future = executor.submit(*args)
+            except BrokenProcessPool:
+                future = self._replace_executor(executor).submit(*args)
+        except Exception as e:
+            with self._lock:
+                self.store.update(job_id, status='failed', stage=None,
+                                  error=f"Error during summarization: {str(e)}")
+            raise
+        future.add_done_callback(lambda done: self._finish(job_id, done))
+        return job_id
+
+    def _replace_executor(self, broken):
+        """Swap a broken pool for a new one (once, if several callers race)"""
+        with self._lock:
+            replaced = self._executor is broken
+            if replaced:
+                self._executor = self._create_executor()
+            executor = self._executor
+        if replaced:
+            broken.shutdown(wait=False, cancel_futures=True)
+        return executor
+
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+    def _copy_progress(self):
+        while True:
+            event = self._events.get()
+            if event is None:
+                return
+            job_id, stage = event
+            with self._lock:
+                job = self.store.get(job_id)
+                # A stage reported after the job finished must not reopen it
+                if job is not None and job['status'] not in FINISHED:
+                    self.store.update(job_id, status='running', stage=stage)
+
+    def _finish(self, job_id, future):
+        try:
+            outcome = future.result()
+        except Exception as e:
+            outcome = {'status': 'failed', 'error': f"Error during summarization: {str(e)}"}
+        with self._lock:
+            self.store.update(job_id, stage=None, **outcome)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._events.put(None)
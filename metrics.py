@@ -0,0 +1,65 @@
+"""
+Prometheus metrics for the summarization pipeline
+"""
+
+import threading
+from collections import defaultdict
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+class PrometheusObserver:
+    """
+    Pipeline observer (see Summarize_Text.add_observer) that aggregates the
+    events into counters and a per-stage duration histogram, and renders
+    them in the Prometheus text exposition format.
+    """
+
+    def __init__(self, prefix='summarizer'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._buckets = defaultdict(lambda: [0] * len(STAGE_BUCKETS))
+        self._stage_sum = defaultdict(float)
+        self._stage_count = defaultdict(int)
+        self._counters = {kind: defaultdict(int) for kind in ('count', 'fallback', 'error', 'cache')}
+
+    def __call__(self, kind, name, value=1):
+        with self._lock:
+            if kind == 'stage':
+                buckets = self._buckets[name]
+                for i, bound in enumerate(STAGE_BUCKETS):
+                    if value <= bound:
+                        buckets[i] += 1
+                self._stage_sum[name] += value
+                self._stage_count[name] += 1
+            elif kind in self._counters:
+                self._counters[kind][name] += value
+
+    def render(self):
+        """All metrics in the Prometheus text format"""
+        p = self.prefix
+        lines = [
+            f"# HELP {p}_stage_duration_seconds Time spent in each pipeline stage.",
+            f"# TYPE {p}_stage_duration_seconds histogram",
+        ]
+        with self._lock:
+            for stage in sorted(self._stage_count):
+                for bound, count in zip(STAGE_BUCKETS, self._buckets[stage]):
+                    lines.append(f'{p}_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'{p}_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} '
+                             f'{self._stage_count[stage]}')
+                lines.append(f'{p}_stage_duration_seconds_sum{{stage="{stage}"}} {self._stage_sum[stage]}')
+                lines.append(f'{p}_stage_duration_seconds_count{{stage="{stage}"}} {self._stage_count[stage]}')
+
+            families = [
+                ('items_total', 'count', 'item', 'Sentences, tokens and similarity matrix entries processed.'),
+                ('fallbacks_total', 'fallback', 'reason', 'Ranking fallbacks taken.'),
+                ('errors_total', 'error', 'reason', 'Texts that could not be summarized.'),
+                ('cache_requests_total', 'cache', 'result', 'Ranking cache lookups.'),
+            ]
+            for metric, kind, label, help_text in families:
+                lines.append(f"# HELP {p}_{metric} {help_text}")
+                lines.append(f"# TYPE {p}_{metric} counter")
+                for name, value in sorted(self._counters[kind].items()):
+                    lines.append(f'{p}_{metric}{{{label}="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
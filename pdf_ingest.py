@@ -0,0 +1,78 @@
+"""
+Streaming PDF text extraction for the GUI, CLI and web app
+"""
+
+from Summarize_Text import bounded_map
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+# Readers opened by a pool worker, so each worker parses the PDF only once
+_worker_readers = {}
+
+def _open_reader(path):
+    import PyPDF2
+    return PyPDF2.PdfReader(path)
+
+def page_count(path):
+    """Number of pages in a PDF file"""
+    return len(_open_reader(path).pages)
+
+def parse_page_range(spec, num_pages):
+    """
+    Turn a page range such as "1-3,7,10-" into 0-based page indices.
+
+    Pages are 1-based and ranges are inclusive; an open end ("10-") runs to
+    the last page. None or an empty spec selects every page.
+    """
+    if not spec:
+        return list(range(num_pages))
+    pages = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-', 1)
+            first = int(first) if first.strip() else 1
+            last = int(last) if last.strip() else num_pages
+        else:
+            first = last = int(part)
+        if first < 1 or last < first:
+            raise ValueError(f"Invalid page range '{part}'")
+        pages.extend(range(first - 1, min(last, num_pages)))
+    return pages
+
+def _extract_pages(page_numbers, path):
+    """Extract the text of some pages (runs in a worker process)"""
+    if path not in _worker_readers:
+        _worker_readers[path] = _open_reader(path)
+    pages = _worker_readers[path].pages
+    return [pages[number].extract_text() or "" for number in page_numbers]
+
+def iter_pdf_pages(path, pages=None, jobs=None, chunk_size=8):
+    """
+    Yield the text of each selected page of a PDF, in page order.
+
+    pages is a page range string (see parse_page_range). With jobs > 1 the
+    pages are extracted in that many worker processes, chunk_size pages at
+    a time. Only a few chunks are in flight at once, so memory stays bounded
+    however long the document is, and the first pages can be used while
+    the rest are still being extracted.
+    """
+    reader = _open_reader(path)
+    selected = parse_page_range(pages, len(reader.pages))
+
+    if not jobs or jobs <= 1:
+        for number in selected:
+            yield reader.pages[number].extract_text() or ""
+        return
+
+    chunks = [selected[i:i + chunk_size] for i in range(0, len(selected), chunk_size)]
+    extract = partial(_extract_pages, path=path)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for texts in bounded_map(executor, extract, chunks, 2 * jobs):
+            yield from texts
+
+def extract_pdf_text(path, pages=None, jobs=None):
+    """Extract the text of a PDF (or a range of its pages) as one string"""
+    return "".join(text + "\n" for text in iter_pdf_pages(path, pages, jobs))
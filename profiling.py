@@ -0,0 +1,149 @@
+"""
+Profiling mode: where a slow document spends its time and memory
+"""
+
+import cProfile
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+from Summarize_Text import add_observer, remove_observer
+
+# Pipeline stage of a profiled function, from its file or name (first match wins)
+STAGE_RULES = [
+    ('importlib', 'import'),
+    ('langdetect', 'detect'),
+    ('nltk', 'tokenize'),
+    ('feature_extraction', 'tfidf'),
+    ('_batch_tfidf', 'tfidf'),
+    ('build_similarity_graph', 'similarity'),
+    ('pairwise', 'similarity'),
+    ('networkx', 'rank'),
+    ('pagerank', 'rank'),
+    ('rank_graph', 'rank'),
+    ('tokenize_sentences', 'preprocess'),
+    ('_sentence_tokens', 'preprocess'),
+    ('_clean_document', 'preprocess'),
+    ('get_stopwords', 'preprocess'),
+    ('multilingual_tokenize', 'tokenize'),
+    ('detect_language', 'detect'),
+]
+
+def stage_of(filename, function):
+    """Pipeline stage a profiled function belongs to, or '-' if none"""
+    for pattern, stage in STAGE_RULES:
+        if pattern in filename or pattern == function:
+            return stage
+    return '-'
+
+def _caller_stage(stats, func):
+    """
+    Stage of a function, or of its nearest caller with a known stage, so
+    builtins and helpers are charged to the stage that called them
+    """
+    seen = {func}
+    frontier = [func]
+    while frontier:
+        callers = []
+        for filename, line, function in frontier:
+            stage = stage_of(filename, function)
+            if stage != '-':
+                return stage
+            for caller in stats[(filename, line, function)][4]:
+                if caller not in seen and caller in stats:
+                    seen.add(caller)
+                    callers.append(caller)
+        frontier = callers
+    return '-'
+
+class Profile:
+    """
+    Context manager that profiles the code it wraps.
+
+    Inside the block, cProfile records function timings for the calling
+    thread, tracemalloc traces allocations, and the pipeline observer hooks
+    record the duration of each stage. Afterwards, report() gives a short
+    top-N summary and dump(path) writes the cProfile data (for snakeviz,
+    pstats, ...). tracemalloc is process-wide, so profiles are taken one at
+    a time.
+    """
+
+    _active = threading.Lock()
+
+    def __init__(self, top=15, trace_memory=True):
+        self.top = top
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self.wall_time = 0.0
+        self.peak_memory = None
+        self._snapshot = None
+        self._profiler = cProfile.Profile()
+        self._thread = threading.get_ident()
+
+    def _on_event(self, kind, name, value):
+        # Only stages of the profiled thread, not of concurrent requests
+        if kind == 'stage' and threading.get_ident() == self._thread:
+            self.stages[name] = self.stages.get(name, 0.0) + value
+
+    def __enter__(self):
+        Profile._active.acquire()
+        self._thread = threading.get_ident()
+        add_observer(self._on_event)
+        if self.trace_memory:
+            tracemalloc.start()
+        self._start = time.perf_counter()
+        self._profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._profiler.disable()
+        self.wall_time = time.perf_counter() - self._start
+        try:
+            if self.trace_memory:
+                self.peak_memory = tracemalloc.get_traced_memory()[1]
+                self._snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+            remove_observer(self._on_event)
+        finally:
+            Profile._active.release()
+
+    def dump(self, path):
+        """Write the cProfile data to path (pstats format)"""
+        self._profiler.dump_stats(path)
+        return path
+
+    def hot_functions(self):
+        """(stage, own seconds, cumulative seconds, calls, function) for the top functions"""
+        stats = pstats.Stats(self._profiler, stream=io.StringIO()).stats
+        hottest = sorted(stats, key=lambda func: stats[func][2], reverse=True)[:self.top]
+        rows = []
+        for func in hottest:
+            filename, line, function = func
+            _, calls, own, cumulative, _ = stats[func]
+            rows.append((_caller_stage(stats, func), own, cumulative, calls,
+                         f"{filename.rsplit('/', 1)[-1]}:{line}({function})"))
+        return rows
+
+    def report(self):
+        """Stage durations, hottest functions and top allocation sites, as text"""
+        lines = [f"Profile: {self.wall_time * 1000:.1f} ms wall time"]
+        if self.stages:
+            lines.append("\nTime per pipeline stage:")
+            for stage, seconds in sorted(self.stages.items(), key=lambda item: -item[1]):
+                share = seconds / self.wall_time if self.wall_time else 0
+                lines.append(f"  {stage:<12}{seconds * 1000:10.2f} ms  {share:6.1%}")
+
+        lines.append(f"\nHottest functions (top {self.top} by own time):")
+        lines.append(f"  {'stage':<12}{'own ms':>10}{'cum ms':>10}{'calls':>9}  function")
+        for stage, own, cumulative, calls, function in self.hot_functions():
+            lines.append(f"  {stage:<12}{own * 1000:10.2f}{cumulative * 1000:10.2f}{calls:9d}  {function}")
+
+        if self._snapshot is not None:
+            lines.append(f"\nPeak traced memory: {self.peak_memory / 2**20:.1f} MiB; "
+                         f"largest allocation sites still held:")
+            for stat in self._snapshot.statistics('lineno')[:self.top // 3 or 1]:
+                frame = stat.traceback[0]
+                lines.append(f"  {stat.size / 1024:10.1f} KiB  "
+                             f"{frame.filename.rsplit('/', 1)[-1]}:{frame.lineno}")
+        return "\n".join(lines)
@@ -0,0 +1,119 @@
+"""
+Streaming summarization of unbounded text (stdin, sockets, logs)
+"""
+
+import time
+from collections import deque
+from Summarize_Text import detect_language, multilingual_tokenize
+from incremental import IncrementalSummarizer
+
+# Characters gathered before the language of a stream is detected
+DETECTION_MIN_CHARS = 200
+
+class StreamSummarizer:
+    """
+    Summarizes a continuous feed of text over a rolling window of sentences.
+
+    Text is fed in chunks of any size; complete sentences are split off as
+    they arrive and only the last window sentences are kept, in an
+    IncrementalSummarizer, so memory stays constant however long the stream
+    runs. A summary is due every `every` sentences or, if interval is set,
+    when interval seconds have passed since the last one (checked as text
+    arrives). A sentence longer than max_buffer_chars is cut off there.
+    """
+
+    def __init__(self, num_sentences=5, language=None, window=500, every=50, interval=None,
+                 max_buffer_chars=10000):
+        self.num_sentences = num_sentences
+        self.language = language
+        self.window = window
+        self.every = every
+        self.interval = interval
+        self.max_buffer_chars = max_buffer_chars
+        self.sentences_seen = 0
+        self._buffer = ""
+        self._window = deque()
+        self._pending = deque(maxlen=window)
+        self._summarizer = None
+        self._since_summary = 0
+        self._last_summary = time.monotonic()
+
+    def feed(self, text):
+        """Add text to the stream; returns a Summary when one is due, else None"""
+        self._buffer += text
+        self._take_sentences(final=False)
+        due = self._since_summary >= self.every or (
+            self.interval is not None and self._since_summary and
+            time.monotonic() - self._last_summary >= self.interval)
+        return self.summary() if due else None
+
+    def flush(self):
+        """End of stream: the trailing partial sentence counts as complete"""
+        self._take_sentences(final=True)
+        return self.summary()
+
+    def summary(self):
+        """Summary of the sentences currently in the window"""
+        self._sync()
+        self._since_summary = 0
+        self._last_summary = time.monotonic()
+        return self._summarizer.summary(self.num_sentences)
+
+    def _take_sentences(self, final):
+        if not self._buffer.strip():
+            return
+        if self.language is None:
+            if len(self._buffer) < DETECTION_MIN_CHARS and not final:
+                return
+            self.language = detect_language(self._buffer)
+
+        sentences = multilingual_tokenize(self._buffer, self.language)
+        if final or len(self._buffer) > self.max_buffer_chars:
+            complete, self._buffer = sentences, ""
+        elif len(sentences) > 1:
+            # The last sentence may still be incomplete; keep it buffered
+            complete = sentences[:-1]
+            start = self._buffer.rfind(sentences[-1])
+            self._buffer = self._buffer[start:] if start >= 0 else sentences[-1]
+        else:
+            return
+        self._pending.extend(complete)
+        self.sentences_seen += len(complete)
+        self._since_summary += len(complete)
+
+    def _sync(self):
+        """Move pending sentences into the window, dropping the oldest ones"""
+        if self._summarizer is None:
+            self._summarizer = IncrementalSummarizer(self.language)
+        if not self._pending:
+            return
+        overflow = len(self._window) + len(self._pending) - self.window
+        if overflow >= len(self._window):
+            # Nothing of the old window survives
+            self._window = deque(self._pending)
+            self._summarizer = IncrementalSummarizer(self.language)
+            self._summarizer.update(" ".join(self._window))
+        else:
+            if overflow > 0:
+                for _ in range(overflow):
+                    self._window.popleft()
+                self._summarizer.update(" ".join(self._window))
+            addition = " ".join(self._pending)
+            self._summarizer.append(" " + addition if self._window else addition)
+            self._window.extend(self._pending)
+        self._pending.clear()
+
+def summarize_stream(chunks, num_sentences=5, language=None, window=500, every=50,
+                     interval=None):
+    """
+    Summarize an iterable of text chunks (lines of a file, socket reads...),
+    yielding (sentences_seen, Summary) each time a summary is due and once
+    more at the end of the stream.
+    """
+    stream = StreamSummarizer(num_sentences, language, window, every, interval)
+    for chunk in chunks:
+        summary = stream.feed(chunk)
+        if summary is not None:
+            yield stream.sentences_seen, summary
+    summary = stream.flush()
+    yield stream.sentences_seen, summary
@@ -0,0 +1,186 @@
+"""
+Content-addressed cache for ranked documents
+"""
+
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from Summarize_Text import rank_document, emit, RankedDocument, Summary, SummarizationError
+
+class SummaryCache:
+    """
+    Caches the RankedDocument of each text, so repeated submissions are
+    served without rerunning the pipeline.
+
+    The ranking is cached rather than the summary string, so a request for a
+    different number of sentences on the same text is a hit as well. Entries
+    live in an in-memory LRU bounded by max_entries and by max_bytes, the
+    approximate size of the cached sentences, so a few huge documents cannot
+    exhaust memory. When path is given they are also kept in an SQLite
+    database that survives restarts, holding at most max_rows rankings (the
+    oldest are deleted first) for at most ttl seconds, if set. Texts that
+    cannot be summarized are cached with their error message in memory only,
+    so the database never fills up with rejected input.
+    """
+
+    def __init__(self, max_entries=1024, path=None, max_bytes=256 * 2**20, max_rows=100000,
+                 ttl=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS rankings (key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "stored REAL NOT NULL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS rankings_stored ON rankings (stored)")
+            self._db.commit()
+
+    @staticmethod
+    def make_key(text, language=None, **options):
+        """Hash the whitespace-normalised text, language and ranking options"""
+        normalized = " ".join(text.split())
+        settings = json.dumps([language or 'auto', sorted(options.items())])
+        digest = hashlib.sha256(settings.encode('utf-8'))
+        digest.update(b'\0' + normalized.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached entry for key, or None on a miss"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                emit('cache', 'hit')
+                return self._entries[key]
+            if self._db is not None:
+                row = self._db.execute("SELECT value, stored FROM rankings WHERE key = ?",
+                                       (key,)).fetchone()
+                if row is not None and not self._expired(row[1], time.time()):
+                    value = self._decode(row[0])
+                    self._remember(key, value)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    emit('cache', 'disk_hit')
+                    return value
+            self.misses += 1
+            emit('cache', 'miss')
+            return None
+
+    def put(self, key, value):
+        """Store an entry in memory and, if it is a ranking and enabled, on disk"""
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None and isinstance(value, RankedDocument):
+                now = time.time()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO rankings (key, value, stored) VALUES (?, ?, ?)",
+                    (key, self._encode(value), now))
+                self._evict_rows(now)
+                self._db.commit()
+
+    def _expired(self, stored, now):
+        return self.ttl is not None and now - stored > self.ttl
+
+    def _evict_rows(self, now):
+        if self.ttl is not None:
+            self._db.execute("DELETE FROM rankings WHERE stored < ?", (now - self.ttl,))
+        if self.max_rows is not None:
+            # Walks the stored index past the newest max_rows rows only
+            self._db.execute(
+                "DELETE FROM rankings WHERE key IN (SELECT key FROM rankings "
+                "ORDER BY stored DESC LIMIT -1 OFFSET ?)", (self.max_rows,))
+
+    @staticmethod
+    def _encode(value):
+        return json.dumps({'document': value.to_dict()}, ensure_ascii=False)
+
+    @staticmethod
+    def _decode(data):
+        return RankedDocument.from_dict(json.loads(data)['document'])
+
+    @staticmethod
+    def entry_size(value):
+        """Approximate memory held by an entry, in bytes"""
+        if isinstance(value, RankedDocument):
+            # The sentence strings, plus a position, a score and list slots per sentence
+            return sum(sys.getsizeof(sentence) + 64 for sentence in value.sentences)
+        return sys.getsizeof(str(value)) + 64
+
+    def _remember(self, key, value):
+        self.bytes -= self._sizes.pop(key, 0)
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._sizes[key] = self.entry_size(value)
+        self.bytes += self._sizes[key]
+        # An entry larger than max_bytes on its own is not kept in memory at all
+        while self._entries and (len(self._entries) > self.max_entries or
+                                 (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            evicted, _ = self._entries.popitem(last=False)
+            self.bytes -= self._sizes.pop(evicted)
+
+    def rank_document(self, text, language=None, **options):
+        """
+        Cached equivalent of Summarize_Text.rank_document.
+
+        Entries are either a RankedDocument or the SummarizationError raised
+        for the text, which is raised again on every hit.
+        """
+        key = self.make_key(text, language, **options)
+        entry = self.get(key)
+        if entry is None:
+            try:
+                entry = rank_document(text, language, **options)
+            except SummarizationError as e:
+                entry = e
+            self.put(key, entry)
+        if isinstance(entry, SummarizationError):
+            raise entry
+        return entry
+
+    def summarize(self, text, num_sentences=5, language=None, **options):
+        """Cached equivalent of summarize_text"""
+        try:
+            return self.rank_document(text, language, **options).summary(num_sentences)
+        except SummarizationError as e:
+            return Summary(str(e), e.language, error=True)
+        except Exception as e:
+            return Summary(f"Error during summarization: {str(e)}", language, error=True)
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'persistent': self._db is not None,
+            }
+
+    def clear(self):
+        """Drop every cached entry (memory and disk) and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.bytes = 0
+            self.hits = self.disk_hits = self.misses = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM rankings")
+                self._db.commit()
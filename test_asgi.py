@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test script to check the ASGI serving path and its backpressure
+"""
+
+import asyncio
+import json
+import os
+import signal
+import time
+from asgi_app import SummarizerApp
+from summary_cache import SummaryCache
+import app as flask_module
+from benchmark import generate_text
+
+async def raw_request(app, method, path, chunks=(b'',), headers=(), query=b''):
+    """Call the ASGI app in-process and return (status, headers, body bytes)"""
+    messages = [{'type': 'http.request', 'body': chunk, 'more_body': i < len(chunks) - 1}
+                for i, chunk in enumerate(chunks)]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query,
+             'headers': [(b'content-type', b'application/json')] + list(headers)}
+    await app(scope, receive, send)
+    return (sent[0]['status'], dict(sent[0]['headers']),
+            b''.join(message.get('body', b'') for message in sent[1:]))
+
+async def request(app, method, path, body=None):
+    """Call the ASGI app in-process and return (status, headers, JSON body)"""
+    status, headers, payload = await raw_request(app, method, path, [json.dumps(body or {}).encode()])
+    return status, headers, json.loads(payload)
+
+def test_summarize_and_backpressure():
+    app = SummarizerApp(jobs=1, max_queue=0, timeout=60)
+    try:
+        text = generate_text(40)
+        status, _, data = asyncio.run(request(app, 'POST', '/summarize',
+                                              {'text': text, 'sentences': 2, 'language': 'en'}))
+        assert status == 200 and data['detected_language'] == 'en'
+        assert data['summary'].count('.') == 2
+
+        # One worker and no queue: of three new documents sent at once, two are turned away
+        async def burst():
+            return await asyncio.gather(*(
+                request(app, 'POST', '/summarize', {'text': generate_text(400, seed)})
+                for seed in range(1, 4)))
+        responses = asyncio.run(burst())
+        assert sorted(status for status, _, _ in responses) == [200, 429, 429]
+        assert all(int(headers[b'retry-after']) >= 1
+                   for status, headers, _ in responses if status == 429)
+
+        status, _, data = asyncio.run(request(app, 'GET', '/stats'))
+        assert data['pool']['rejected'] == 2 and data['cache']['entries'] == 2
+    finally:
+        app.stop()
+
+def test_request_timeout():
+    app = SummarizerApp(jobs=1, timeout=0.001)
+    try:
+        status, headers, _ = asyncio.run(request(app, 'POST', '/summarize',
+                                                 {'text': generate_text(2000)}))
+        assert status == 503 and b'retry-after' in headers
+    finally:
+        app.stop()
+
+def test_dead_worker_is_replaced():
+    app = SummarizerApp(jobs=1, timeout=60)
+    try:
+        # A first request starts the worker
+        asyncio.run(request(app, 'POST', '/summarize', {'text': generate_text(20), 'language': 'en'}))
+        pool = app.pool
+        for pid in list(pool._executor._processes):
+            os.kill(pid, signal.SIGKILL)
+        time.sleep(0.5)
+        status, headers, _ = asyncio.run(request(app, 'POST', '/summarize',
+                                                 {'text': generate_text(30), 'language': 'en'}))
+        assert status == 503 and b'retry-after' in headers
+        assert pool.in_flight == 0 and pool.restarts == 1
+
+        # The replacement pool serves the next request
+        status, _, data = asyncio.run(request(app, 'POST', '/summarize',
+                                              {'text': generate_text(40), 'language': 'en'}))
+        assert status == 200 and data['detected_language'] == 'en'
+    finally:
+        app.stop()
+
+def test_flask_routes_are_served():
+    app = SummarizerApp(jobs=1, timeout=60, cache=SummaryCache(), wsgi_app=flask_module.app)
+    try:
+        text = generate_text(30, 5)
+        status, _, data = asyncio.run(request(app, 'POST', '/summarize',
+                                              {'text': text, 'language': 'en', 'dedup': True}))
+        assert status == 200 and data['summary']
+
+        # Stages run in the worker process show up in the server's metrics
+        status, headers, body = asyncio.run(raw_request(app, 'GET', '/metrics'))
+        assert status == 200 and b'text/plain' in headers[b'content-type']
+        assert b'summarizer_stage_duration_seconds_count{stage="dedup"}' in body
+
+        # A streamed NDJSON body, sent in pieces, streams back one line per document
+        lines = [json.dumps({'id': i, 'text': generate_text(10, i)}).encode() + b"\n"
+                 for i in range(3)]
+        status, _, body = asyncio.run(raw_request(app, 'POST', '/summarize/batch', lines,
+                                                  query=b'sentences=2&language=en'))
+        records = [json.loads(line) for line in body.splitlines()]
+        assert status == 200 and [record['id'] for record in records] == [0, 1, 2]
+
+        status, _, _ = asyncio.run(raw_request(app, 'GET', '/no-such-page'))
+        assert status == 404
+    finally:
+        app.stop()
+
+def test_rank_and_validation():
+    app = SummarizerApp(jobs=1, timeout=60, cache=SummaryCache(), wsgi_app=flask_module.app)
+    try:
+        text = generate_text(20, 7)
+        status, _, data = asyncio.run(request(app, 'POST', '/rank', {'text': text, 'language': 'en'}))
+        assert status == 200 and len(data['sentences']) == 20
+        assert app.pool.stats()['completed'] == 1
+
+        for sentences in (None, 0, -1, 'many'):
+            status, _, data = asyncio.run(request(app, 'POST', '/summarize',
+                                                  {'text': text, 'sentences': sentences}))
+            assert status == 400 and data['error'].startswith('Invalid request')
+
+        # With profiling off, asking for a profile does not leave the pool
+        status, _, data = asyncio.run(raw_request(
+            app, 'POST', '/summarize',
+            [json.dumps({'text': generate_text(20, 8), 'language': 'en'}).encode()],
+            headers=[(b'x-profile', b'1')]))
+        assert status == 200 and 'profile' not in json.loads(data)
+        assert app.pool.stats()['completed'] == 2
+
+        # Threaded CPU routes are admitted jobs at a time
+        app.threaded = app.jobs
+        status, headers, _ = asyncio.run(raw_request(app, 'POST', '/summarize/topics',
+                                                     [json.dumps({'text': text}).encode()]))
+        assert status == 429 and b'retry-after' in headers
+        app.threaded = 0
+    finally:
+        app.stop()
+
+if __name__ == "__main__":
+    test_summarize_and_backpressure()
+    test_request_timeout()
+    test_dead_worker_is_replaced()
+    test_flask_routes_are_served()
+    test_rank_and_validation()
+    print("[OK] ASGI serving path")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test script to check batch summarization against single-document summaries
+"""
+
+from Summarize_Text import summarize_text, summarize_many, rank_document, summarize_topics
+from test_multilingual import test_texts
+from benchmark import generate_text
+import json
+import app as flask_module
+
+def post_batch(body, query='sentences=2&language=en&batch_size=2'):
+    response = flask_module.app.test_client().post(f'/summarize/batch?{query}', data=body)
+    return response.status_code, [json.loads(line) for line in response.data.splitlines()]
+
+def test_summarize_many_matches_summarize_text():
+    texts = [text.strip() for text in test_texts.values()]
+    texts += ["", "Only one sentence here."]
+    expected = [summarize_text(text, 2) for text in texts]
+    assert list(summarize_many(texts, 2, batch_size=3)) == expected
+
+def test_hierarchical_ranking():
+    text = generate_text(450)
+    # Short enough for a single chunk: identical to the flat ranking
+    assert rank_document(text, 'en', chunk_size=500).order == rank_document(text, 'en').order
+
+    document = rank_document(text, 'en', chunk_size=40, candidates=5)
+    # 12 chunks of 40 keep 60 candidates (5 each); the 2 chunks of those keep
+    # 20 each, so the final ranking still weighs 40 candidates
+    assert len(document) == 40
+    # A summary longer than the default candidates is never cut short
+    summary = summarize_text(text, 15, 'en', chunk_size=40)
+    assert summary.count('. ') == 14
+    assert summarize_text(text, 3, 'en', chunk_size=3).count('. ') == 2
+
+    # The default candidates are capped for small chunks; a chunk needs 2 sentences
+    assert len(rank_document(text, 'en', chunk_size=10)) == 10
+    try:
+        rank_document(text, 'en', chunk_size=1)
+        assert False, "chunk_size=1 must be rejected"
+    except ValueError as e:
+        assert 'chunk_size' in str(e)
+    assert document.order == rank_document(text, 'en', chunk_size=40, candidates=5, jobs=2).order
+
+def test_summarize_topics():
+    report = "Report\n" + "\n".join(f"\nSection {i}\n{generate_text(12, i).lower()}\n"
+                                     for i in range(6))
+    topics = summarize_topics(report, 12, 'en')
+    assert [heading for heading, _ in topics] == [f"Section {i}" for i in range(6)]
+    assert all(summary.count('.') == 2 and summary.language == 'en' for _, summary in topics)
+    assert summarize_topics(report, 12, 'en', jobs=2) == topics
+    assert summarize_topics("No headings here. Just two sentences.") == []
+
+def test_batch_route():
+    texts = [generate_text(8, i) for i in range(3)]
+    expected = [summarize_text(text, 2, 'en') for text in texts]
+
+    # JSON array mixing strings and objects; ids are echoed back
+    status, records = post_batch(json.dumps([texts[0], {'id': 'b', 'text': texts[1]}, texts[2]]))
+    assert status == 200
+    assert [record.get('id') for record in records] == [None, 'b', None]
+    assert [record['summary'] for record in records] == expected
+
+    # NDJSON with a blank line, a malformed line and a bad item mid-stream
+    lines = [json.dumps({'id': 1, 'text': texts[0]}), '', '{"id": 2, "text": ',
+             json.dumps({'id': 3, 'text': 42}), json.dumps(7), json.dumps(texts[2])]
+    status, records = post_batch("\n".join(lines) + "\n")
+    assert [record['index'] for record in records] == [0, 1, 2, 3, 4]
+    assert records[0]['id'] == 1 and records[0]['summary'] == expected[0]
+    assert records[1]['error'].startswith('Invalid JSON line')
+    assert records[2]['id'] == 3 and records[2]['error'] == "'text' must be a string"
+    assert 'summary' not in records[3] and records[3]['error']
+    assert records[4]['summary'] == expected[2]
+
+    for query in ('sentences=abc', 'sentences=0', 'batch_size=-1'):
+        status, records = post_batch(json.dumps(texts), query)
+        assert status == 400 and 'must be a positive integer' in records[0]['error']
+
+if __name__ == "__main__":
+    test_summarize_many_matches_summarize_text()
+    test_batch_route()
+    test_hierarchical_ranking()
+    test_summarize_topics()
+    print("[OK] summarize_many matches summarize_text")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script to check the command-line batch mode: input expansion and JSONL records
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from cli_app import iter_input_paths
+from Summarize_Text import summarize_text
+from benchmark import generate_text
+
+CLI = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cli_app.py')
+
+def make_corpus(root):
+    root = os.path.join(root, 'corpus')
+    os.makedirs(os.path.join(root, 'b'))
+    paths = [os.path.join(root, name) for name in ('a.txt', os.path.join('b', 'c.txt'), 'd.md')]
+    for seed, path in enumerate(paths):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(generate_text(12, seed))
+    return root, paths
+
+def test_input_expansion():
+    with tempfile.TemporaryDirectory() as root:
+        corpus, (a, c, d) = make_corpus(root)
+        listing = os.path.join(root, 'list.txt')
+        with open(listing, 'w', encoding='utf-8') as f:
+            f.write(f"{d}\n\n{a}\n")
+
+        def paths(*inputs, pattern='*.txt', from_list=None):
+            args = argparse.Namespace(file=None, paths=list(inputs), pattern=pattern,
+                                      from_list=from_list)
+            return list(iter_input_paths(args))
+
+        # Directories are searched recursively for --pattern, in sorted order
+        assert paths(corpus) == [a, c]
+        assert paths(corpus, pattern='*.md') == [d]
+        assert paths(os.path.join(corpus, '**', '*.txt')) == [a, c]
+        assert paths(d, from_list=listing) == [d, d, a]
+
+def test_jsonl_records():
+    with tempfile.TemporaryDirectory() as root:
+        corpus, (a, c, _) = make_corpus(root)
+        missing = os.path.join(root, 'missing.txt')
+        short = os.path.join(root, 'short.txt')
+        with open(short, 'w', encoding='utf-8') as f:
+            f.write("Only one sentence here.")
+        result = subprocess.run([sys.executable, CLI, corpus, missing, short, '--jsonl', '-l', 'en',
+                                 '-n', '2'], capture_output=True, text=True, check=True)
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        assert [record['path'] for record in records] == [a, c, missing, short]
+        with open(a, encoding='utf-8') as f:
+            assert records[0]['summary'] == summarize_text(f.read(), 2, 'en')
+        assert records[0]['language'] == 'en' and 'summarize_ms' in records[0]['timings']
+        # Failures carry an error and no summary
+        assert 'summary' not in records[2] and 'No such file' in records[2]['error']
+        assert 'summary' not in records[3] and records[3]['error'].startswith('Error:')
+
+        # Without input paths, the text on stdin is the document
+        result = subprocess.run([sys.executable, CLI, '--jsonl', '-l', 'en', '-n', '1'],
+                                input=generate_text(5), capture_output=True, text=True,
+                                check=True)
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        assert len(records) == 1 and records[0]['path'] == '-' and records[0]['summary']
+
+if __name__ == "__main__":
+    test_input_expansion()
+    test_jsonl_records()
+    print("[OK] CLI batch mode")
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Test script to check near-duplicate sentence suppression
+"""
+
+from dedup import near_duplicates, collapse_near_duplicates
+from Summarize_Text import rank_document, summarize_text
+from benchmark import generate_text
+
+FOOTER = "Confidential report of the energy market committee. All rights reserved by the company."
+
+def test_near_duplicates():
+    sentence = "market policy energy climate science data model city river health".split()
+    edited = sentence[:-1] + ['school']   # Jaccard 15/23: below the 0.8 threshold
+    groups = near_duplicates([sentence, "water price trade growth".split(), sentence,
+                              sentence + ['health'], edited])
+    assert groups == [0, 1, 0, 0, 4]
+
+    kept, multiplicity = collapse_near_duplicates([0, 2, 3, 5], [['a', 'b'], [], ['c', 'd'],
+                                                                 ['a', 'b'], [], ['a', 'b']])
+    assert kept == [0, 2] and multiplicity == [3, 1]
+
+def test_boilerplate_is_collapsed():
+    pages = [f"{generate_text(15, page)} Page {page + 1}. {FOOTER}" for page in range(20)]
+    text = " ".join(pages)
+    plain = rank_document(text, 'en')
+    deduplicated = rank_document(text, 'en', dedup=True)
+    # The footer's two sentences and "Page N." (numbers are cleaned away) are
+    # ranked once instead of 20 times each
+    assert len(plain) - len(deduplicated) == 57
+    summary = deduplicated.summary(10)
+    assert summary.count("Confidential report") <= 1
+    assert rank_document(text, 'en', dedup=True, compact=True, chunk_size=100).language == 'en'
+
+def test_all_duplicates_fall_back():
+    # A single sentence would be rejected, so the text is ranked as if dedup were off
+    text = " ".join(["Confidential report of the energy market committee."] * 10)
+    assert rank_document(text, 'en', dedup=True).order == rank_document(text, 'en').order
+    assert not summarize_text(text, 2, 'en', dedup=True).error
+
+if __name__ == "__main__":
+    test_near_duplicates()
+    test_boilerplate_is_collapsed()
+    test_all_duplicates_fall_back()
+    print("[OK] Near-duplicate suppression")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test script to check pre-fitted IDF models against per-text vectorization
+"""
+
+import os
+import pickle
+import tempfile
+from collections import Counter
+import numpy as np
+from idf_model import IdfModel, build_models, load_for_language
+from Summarize_Text import (multilingual_tokenize, tokenize_sentences, rank_document,
+                            summarize_text, _identity_analyzer)
+from benchmark import generate_text
+
+def test_matches_fitted_vectorizer():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    text = generate_text(200, 3)
+    token_lists = tokenize_sentences(text, multilingual_tokenize(text, 'en'), 'en')
+    doc_freq = Counter()
+    for tokens in token_lists:
+        doc_freq.update(set(tokens))
+
+    # A model fitted on the text itself gives the vectorizer's weights
+    model = IdfModel.fit(doc_freq, len(token_lists), 'en', min_df=1)
+    expected = TfidfVectorizer(analyzer=_identity_analyzer).fit_transform(token_lists)
+    vectors = model.transform(token_lists)
+    assert np.allclose((vectors @ vectors.T).toarray(), (expected @ expected.T).toarray())
+
+    # Unknown terms get the highest weight
+    weights = model.weights(['market', 'never-seen'])
+    assert weights[1] == model.unseen_idf > weights[0]
+
+def test_build_and_load():
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = os.path.join(tmp, 'corpus')
+        os.makedirs(corpus)
+        for i in range(5):
+            with open(os.path.join(corpus, f'{i}.txt'), 'w', encoding='utf-8') as f:
+                f.write(generate_text(40, i))
+        models = build_models(corpus, os.path.join(tmp, 'models'), language='en')
+        assert [model.language for model in models] == ['en']
+        assert models[0].info['sentences'] == 200
+
+        model = load_for_language(os.path.join(tmp, 'models'), 'en')
+        assert isinstance(model.hashes, np.memmap)
+        assert load_for_language(os.path.join(tmp, 'models'), 'de') is None
+        assert pickle.loads(pickle.dumps(model)).path == model.path
+
+        text = generate_text(60, 99)
+        document = rank_document(text, 'en', idf_model=model)
+        assert len(document) == 60
+        assert summarize_text(text, 3, 'en', idf_model=model) == document.summary(3)
+        load_for_language.cache_clear()
+
+if __name__ == "__main__":
+    test_matches_fitted_vectorizer()
+    test_build_and_load()
+    print("[OK] IDF models")
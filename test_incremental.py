@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test script to check incremental summarization against full re-summarization
+"""
+
+from incremental import IncrementalSummarizer
+from streaming import summarize_stream, StreamSummarizer
+from Summarize_Text import rank_document, multilingual_tokenize, pagerank, summarize_text
+from test_ranker import random_similarity_matrix
+from benchmark import generate_text
+import numpy as np
+
+def test_appends_and_edits():
+    summarizer = IncrementalSummarizer('en')
+    text = ""
+    for seed in range(6):
+        part = generate_text(30, seed) + " "
+        text += part
+        summarizer.append(part)
+        assert summarizer.document().sentences == multilingual_tokenize(text, 'en')
+
+    sentences = multilingual_tokenize(text, 'en')
+    edited = text.replace(sentences[70], "Music and film for every student.")
+    edited = edited.replace(sentences[10], "")
+    summarizer.update(edited)
+    assert summarizer.document().sentences == multilingual_tokenize(edited, 'en')
+
+    # After a full rebuild the ranking is the one of rank_document
+    summarizer.rebuild()
+    assert summarizer.document().order == rank_document(edited, 'en').order
+
+def test_warm_started_pagerank():
+    sim_mat = random_similarity_matrix(50, 1)
+    scores = pagerank(sim_mat)
+    assert np.allclose(pagerank(sim_mat, nstart=scores), scores, atol=1e-5)
+
+def test_stream_keeps_a_rolling_window():
+    text = generate_text(400, 9)
+    chunks = [text[i:i + 70] for i in range(0, len(text), 70)]
+    results = list(summarize_stream(chunks, 3, 'en', window=100, every=150))
+    assert [seen for seen, _ in results] == [150, 300, 400]
+    # The final summary only covers the last 100 sentences
+    last_window = " ".join(multilingual_tokenize(text, 'en')[-100:])
+    assert results[-1][1] == summarize_text(last_window, 3, 'en')
+
+    stream = StreamSummarizer(language='en', window=50, every=10)
+    for chunk in chunks:
+        stream.feed(chunk)
+    assert len(stream._window) <= 50 and len(stream._buffer) < 200
+
+if __name__ == "__main__":
+    test_appends_and_edits()
+    test_warm_started_pagerank()
+    test_stream_keeps_a_rolling_window()
+    print("[OK] Incremental summarization")
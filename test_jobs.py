@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script to check background summarization jobs and the job stores
+"""
+
+import os
+import signal
+import tempfile
+import time
+from jobs import JobManager, MemoryJobStore, SQLiteJobStore
+from Summarize_Text import summarize_text
+from benchmark import generate_text
+
+def wait_for(manager, job_id, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job['status'] in ('done', 'failed'):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+def test_jobs_with_both_stores():
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    text = generate_text(60)
+    try:
+        for store in (MemoryJobStore(), SQLiteJobStore(path)):
+            manager = JobManager(store, jobs=1)
+            try:
+                job_id = manager.submit(text, 3, 'en')
+                failed_id = manager.submit("Too short.", 3, 'en')
+                job = wait_for(manager, job_id)
+                assert job['status'] == 'done' and job['stage'] is None
+                assert job['result']['summary'] == summarize_text(text, 3, 'en')
+                failed = wait_for(manager, failed_id)
+                assert failed['status'] == 'failed' and failed['error'].startswith('Error:')
+                assert manager.get('missing') is None
+            finally:
+                manager.shutdown()
+    finally:
+        os.remove(path)
+
+def test_finished_jobs_expire():
+    for store in (MemoryJobStore(ttl=0.05), SQLiteJobStore(':memory:', ttl=0.05)):
+        store.create('a')
+        store.create('b')
+        store.update('a', status='running', stage='ranking')
+        assert store.get('a')['stage'] == 'ranking'
+        store.update('a', status='done', result={'summary': 'x'})
+        assert store.get('a')['result'] == {'summary': 'x'}
+        time.sleep(0.1)
+        store.create('c')
+        assert store.get('a') is None
+        # Unfinished jobs never expire
+        assert store.get('b')['status'] == 'queued'
+
+def test_broken_pool_is_replaced():
+    manager = JobManager(MemoryJobStore(), jobs=1)
+    try:
+        text = generate_text(40)
+        assert wait_for(manager, manager.submit(text, 3, 'en'))['status'] == 'done'
+        for pid in list(manager._executor._processes):
+            os.kill(pid, signal.SIGKILL)
+        deadline = time.time() + 10
+        while not manager._executor._broken and time.time() < deadline:
+            time.sleep(0.05)
+        # The next submission gets a new pool instead of an orphaned job
+        job = wait_for(manager, manager.submit(text, 3, 'en'))
+        assert job['status'] == 'done'
+    finally:
+        manager.shutdown()
+
+if __name__ == "__main__":
+    test_jobs_with_both_stores()
+    test_broken_pool_is_replaced()
+    test_finished_jobs_expire()
+    print("[OK] Background jobs")
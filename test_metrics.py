@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script to check pipeline observers, the Prometheus metrics and profiling
+"""
+
+import os
+import tempfile
+from Summarize_Text import (summarize_text, summarize_many, summarize_topics, add_observer,
+                            remove_observer)
+from summary_cache import SummaryCache
+from metrics import PrometheusObserver
+from profiling import Profile, stage_of
+from benchmark import generate_text, time_stages, STAGES
+
+def test_observer_events():
+    events = []
+    observer = lambda kind, name, value: events.append((kind, name, value))
+    add_observer(observer)
+    try:
+        summarize_text(generate_text(20), 3)
+        summarize_text("Just one sentence.", 3, 'en')
+    finally:
+        remove_observer(observer)
+    stages = [name for kind, name, _ in events if kind == 'stage']
+    assert stages == ['detect', 'tokenize', 'preprocess', 'tfidf', 'similarity', 'rank', 'select',
+                      'tokenize']
+    counts = {name: value for kind, name, value in events if kind == 'count'}
+    assert counts['sentences'] == 20 and counts['matrix_entries'] == 400
+    assert ('error', 'too_few_sentences', 1) in events
+
+    # Nothing is recorded once the observer is removed
+    events.clear()
+    summarize_text(generate_text(20), 3, 'en')
+    assert events == []
+
+def test_batch_and_topic_events():
+    events = []
+    observer = lambda kind, name, value: events.append((kind, name, value))
+    add_observer(observer)
+    try:
+        list(summarize_many([generate_text(10), "", "Just one sentence."], 2, 'en'))
+        batch_events = list(events)
+        events.clear()
+        report = "Report\n" + "\n".join(f"\nSection {i}\n{generate_text(6, i).lower()}\n"
+                                         for i in range(2))
+        summarize_topics(report, 4, 'en')
+    finally:
+        remove_observer(observer)
+    for recorded, documents in ((batch_events, 1), (events, 2)):
+        stages = [name for kind, name, _ in recorded if kind == 'stage']
+        for stage in ('tokenize', 'preprocess', 'tfidf', 'similarity', 'rank', 'select'):
+            assert stage in stages
+        assert stages.count('select') == documents
+        assert ('count', 'sentences', 10 if documents == 1 else 6) in recorded
+    assert ('error', 'no_text', 1) in batch_events
+    assert ('error', 'too_few_sentences', 1) in batch_events
+
+def test_prometheus_rendering():
+    metrics = PrometheusObserver()
+    cache = SummaryCache()
+    add_observer(metrics)
+    try:
+        text = generate_text(20)
+        cache.summarize(text, 2, 'en')
+        cache.summarize(text, 4, 'en')
+    finally:
+        remove_observer(metrics)
+    output = metrics.render()
+    assert 'summarizer_cache_requests_total{result="hit"} 1' in output
+    assert 'summarizer_cache_requests_total{result="miss"} 1' in output
+    assert 'summarizer_stage_duration_seconds_count{stage="rank"} 1' in output
+    assert 'summarizer_stage_duration_seconds_bucket{stage="rank",le="+Inf"} 1' in output
+    assert 'summarizer_items_total{item="sentences"} 20' in output
+
+def test_profile_report():
+    with Profile(top=10) as profile:
+        summarize_text(generate_text(50), 3, 'en')
+    assert {'tokenize', 'tfidf', 'rank'} <= set(profile.stages)
+    assert len(profile.hot_functions()) == 10
+    report = profile.report()
+    assert 'Time per pipeline stage' in report and 'Peak traced memory' in report
+    assert stage_of('/site-packages/nltk/tokenize/punkt.py', 'tokenize') == 'tokenize'
+    assert stage_of('/site-packages/sklearn/feature_extraction/text.py', 'fit') == 'tfidf'
+    assert stage_of('Summarize_Text.py', 'pagerank') == 'rank'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = profile.dump(os.path.join(tmp, 'run.prof'))
+        assert os.path.getsize(path) > 0
+
+def test_benchmark_stages_come_from_the_pipeline():
+    timings = time_stages(generate_text(40), 'en')
+    assert list(timings) == STAGES and all(ms > 0 for ms in timings.values())
+
+if __name__ == "__main__":
+    test_observer_events()
+    test_batch_and_topic_events()
+    test_prometheus_rendering()
+    test_profile_report()
+    test_benchmark_stages_come_from_the_pipeline()
+    print("[OK] Observers, metrics and profiling")
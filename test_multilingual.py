@@ -3,7 +3,7 @@
 Test script to demonstrate multilingual text summarization capabilities
 """
 
-from Summarize_Text import summarize_text, detect_language
+from Summarize_Text import summarize_text, detect_language, _detection_sample, tokenize_sentences
 
 # Test texts in different languages
 test_texts = {
@@ -42,5 +42,22 @@ def test_multilingual_summarization():
         print(f"Summary: {summary}")
         print()
 
+def test_detection_sample_windows():
+    german = test_texts["German"].strip()
+    # Long whitespace runs leave some sampled windows without any word
+    text = german + " " * 5000 + german + " " * 5000 + german
+    assert detect_language(text) == detect_language(text, fast=False) == 'de'
+    assert all(part.strip() for part in _detection_sample(text).split("\n"))
+    # Text written without spaces keeps its windows whole
+    chinese = "自然语言处理是计算机科学领域的一个重要方向" * 200
+    assert len(_detection_sample(chinese)) > 1000
+    assert detect_language("1234 5678 !!!") == 'en'
+
+def test_vowel_signs_stay_in_words():
+    # The old TfidfVectorizer pattern kept only ['தம', 'இந'] of this sentence
+    sentence = "தமிழ் மொழி இந்தியா"
+    assert tokenize_sentences(sentence, [sentence], 'ta') == [["தமிழ்", "மொழி", "இந்தியா"]]
+
 if __name__ == "__main__":
-    test_multilingual_summarization()
\ No newline at end of file
+    test_multilingual_summarization()
+    test_detection_sample_windows()
\ No newline at end of file
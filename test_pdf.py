@@ -4,6 +4,7 @@ Test script to verify PDF reading functionality
 """
 
 import PyPDF2
+from pdf_ingest import parse_page_range
 
 def test_pdf_reading():
     print("Testing PDF reading functionality...")
@@ -21,5 +22,12 @@ def test_pdf_reading():
     except Exception as e:
         print(f"[ERROR] Error: {e}")
 
+def test_parse_page_range():
+    assert parse_page_range(None, 4) == [0, 1, 2, 3]
+    assert parse_page_range("1-3,7,10-", 12) == [0, 1, 2, 6, 9, 10, 11]
+    assert parse_page_range("3-8", 5) == [2, 3, 4]
+    print("[OK] Page ranges parsed correctly")
+
 if __name__ == "__main__":
-    test_pdf_reading()
\ No newline at end of file
+    test_pdf_reading()
+    test_parse_page_range()
\ No newline at end of file
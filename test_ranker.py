@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script to check the NumPy PageRank ranker against networkx
+"""
+
+import numpy as np
+from scipy import sparse
+from Summarize_Text import rank_graph, build_similarity_graph, rank_document, _compact_tfidf
+from benchmark import generate_text
+
+def random_similarity_matrix(n, seed):
+    rng = np.random.default_rng(seed)
+    mat = rng.random((n, n))
+    mat[mat < 0.6] = 0  # sparse-ish graph with some isolated rows
+    mat = (mat + mat.T) / 2
+    np.fill_diagonal(mat, 0)
+    mat[0, :] = mat[:, 0] = 0  # dangling node
+    return mat
+
+def test_numpy_ranker_matches_networkx():
+    for seed in range(5):
+        sim_mat = random_similarity_matrix(60, seed)
+        expected = rank_graph(sim_mat, 'networkx')
+        scores = rank_graph(sim_mat, 'numpy')
+        assert np.allclose(scores, expected, atol=1e-5)
+        assert list(np.argsort(-scores)[:10]) == list(np.argsort(-expected)[:10])
+
+def test_personalization_matches_networkx():
+    sim_mat = random_similarity_matrix(50, 11)
+    weights = np.random.default_rng(11).random(50) + 0.5
+    expected = rank_graph(sim_mat, 'networkx', weights)
+    assert np.allclose(rank_graph(sim_mat, 'numpy', weights), expected, atol=1e-5)
+    assert not np.allclose(rank_graph(sim_mat, 'numpy'), expected, atol=1e-5)
+
+def test_numpy_ranker_accepts_sparse_matrix():
+    sim_mat = random_similarity_matrix(40, 7)
+    dense_scores = rank_graph(sim_mat, 'numpy')
+    sparse_scores = rank_graph(sparse.csr_matrix(sim_mat), 'numpy')
+    assert np.allclose(dense_scores, sparse_scores)
+
+def test_sparse_graph_keeps_top_k_neighbours():
+    vectors = sparse.random(120, 50, density=0.2, random_state=3, format='csr')
+    dense = build_similarity_graph(vectors)
+    # With k >= n the sparse graph must reproduce the dense matrix
+    assert np.allclose(build_similarity_graph(vectors, top_k=200, block_size=32).toarray(), dense)
+
+    graph = build_similarity_graph(vectors, top_k=5, block_size=32)
+    assert (graph != graph.T).nnz == 0
+    assert graph.diagonal().sum() == 0
+    # Every row keeps at least its own 5 best neighbours
+    assert all(graph[i].nnz >= 5 for i in range(graph.shape[0]))
+
+def test_compact_mode_stays_float32():
+    vectors = _compact_tfidf([['data', 'model', 'data'], ['model', 'city'], ['city']])
+    assert vectors.dtype == np.float32
+    assert np.allclose(vectors.multiply(vectors).sum(axis=1), 1)
+    sim_mat = build_similarity_graph(vectors)
+    assert sim_mat.dtype == np.float32 and rank_graph(sim_mat).dtype == np.float32
+
+    text = generate_text(400, 5)
+    default = rank_document(text, 'en')
+    compact = rank_document(text, 'en', compact=True)
+    assert len(set(default.order[:10]) & set(compact.order[:10])) >= 8
+
+if __name__ == "__main__":
+    test_numpy_ranker_matches_networkx()
+    test_personalization_matches_networkx()
+    test_numpy_ranker_accepts_sparse_matrix()
+    test_sparse_graph_keeps_top_k_neighbours()
+    test_compact_mode_stays_float32()
+    print("[OK] NumPy ranker matches networkx")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script to check the summary cache hit/miss and eviction behaviour
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+from Summarize_Text import summarize_text
+from summary_cache import SummaryCache
+from test_multilingual import test_texts
+
+def test_cache_serves_any_summary_length():
+    cache = SummaryCache(max_entries=2)
+    text = test_texts["English"].strip()
+    for n in (1, 3, 2):
+        assert cache.summarize(text, n, 'en') == summarize_text(text, n, 'en')
+    assert cache.stats()['hits'] == 2 and cache.stats()['misses'] == 1
+
+def test_cache_evicts_least_recently_used():
+    cache = SummaryCache(max_entries=2)
+    texts = [test_texts[name].strip() for name in ("English", "Spanish", "French")]
+    for text in texts:
+        cache.summarize(text, 2)
+    cache.summarize(texts[0], 2)
+    assert cache.stats() == dict(cache.stats(), hits=0, misses=4, entries=2)
+
+def test_cache_persists_to_disk():
+    path = os.path.join(tempfile.mkdtemp(), 'cache.db')
+    text = test_texts["German"].strip()
+    summary = SummaryCache(path=path).summarize(text, 2)
+    cache = SummaryCache(path=path)
+    assert cache.summarize(text, 2) == summary
+    assert cache.stats()['disk_hits'] == 1
+
+def test_cache_is_bounded_by_size():
+    texts = [test_texts[name].strip() for name in ("English", "Spanish", "French")]
+    sizes = []
+    for text in texts:
+        cache = SummaryCache()
+        cache.summarize(text, 2)
+        sizes.append(cache.stats()['bytes'])
+    cache = SummaryCache(max_bytes=sizes[1] + sizes[2])
+    for text in texts:
+        cache.summarize(text, 2)
+    assert cache.stats()['entries'] == 2 and cache.stats()['bytes'] == sizes[1] + sizes[2]
+    # An entry bigger than the whole budget is not kept
+    cache = SummaryCache(max_bytes=min(sizes) - 1)
+    cache.summarize(texts[0], 2)
+    assert cache.stats() == dict(cache.stats(), entries=0, bytes=0)
+
+def test_disk_rows_are_bounded():
+    path = os.path.join(tempfile.mkdtemp(), 'cache.db')
+    texts = [test_texts[name].strip() for name in ("English", "Spanish", "French")]
+    cache = SummaryCache(path=path, max_rows=2)
+    for text in texts:
+        cache.summarize(text, 2)
+    # Errors are not persisted
+    cache.summarize("Too short.", 2, 'en')
+    db = sqlite3.connect(path)
+    assert db.execute("SELECT COUNT(*) FROM rankings").fetchone()[0] == 2
+    assert SummaryCache(path=path).summarize(texts[0], 2) == summarize_text(texts[0], 2)
+
+    cache = SummaryCache(path=path, ttl=0.05)
+    time.sleep(0.1)
+    assert cache.get(SummaryCache.make_key(texts[2])) is None
+    cache.summarize(texts[0], 2)
+    assert db.execute("SELECT COUNT(*) FROM rankings").fetchone()[0] == 1
+
+if __name__ == "__main__":
+    test_cache_serves_any_summary_length()
+    test_cache_evicts_least_recently_used()
+    test_cache_persists_to_disk()
+    test_cache_is_bounded_by_size()
+    test_disk_rows_are_bounded()
+    print("[OK] Summary cache works")
@@ -1,9 +1,11 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
-from Summarize_Text import summarize_text, detect_language, LANGUAGE_MAPPINGS
+from Summarize_Text import (summarize_text, summarize_topics, detect_language, SummarizationError,
+                            LANGUAGE_MAPPINGS)
+from summary_cache import SummaryCache
+from pdf_ingest import iter_pdf_pages
+import os
 import threading
-import re
-import PyPDF2
 
 class TextSummarizerApp:
     def __init__(self, root):
@@ -26,6 +28,10 @@ class TextSummarizerApp:
             'warning': '#f39c12'
         }
         
+        # Rankings of recently summarized texts, so changing the summary
+        # length only re-slices the ranking instead of recomputing it
+        self.ranking_cache = SummaryCache(max_entries=8)
+        
         self.setup_styles()
         self.create_widgets()
         
@@ -172,6 +178,7 @@ class TextSummarizerApp:
         self.num_sentences = tk.IntVar(value=5)
         sentences_spinbox = ttk.Spinbox(settings_content, from_=1, to=20, 
                                        textvariable=self.num_sentences, 
+                                       command=self.on_length_change,
                                        width=5,
                                        font=("Segoe UI", 10))
         sentences_spinbox.pack(side=tk.LEFT, padx=(10, 0))
@@ -236,18 +243,24 @@ class TextSummarizerApp:
             filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")]
         )
         if file_path:
-            try:
-                with open(file_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    text = ""
-                    for page in pdf_reader.pages:
-                        text += page.extract_text() + "\n"
-                    
-                    self.text_input.delete(1.0, tk.END)
-                    self.text_input.insert(1.0, text)
-                    self.update_status(f"Loaded PDF: {file_path.split('/')[-1]} ({len(pdf_reader.pages)} pages)", 'success')
-            except Exception as e:
-                self.update_status(f"Failed to load PDF: {str(e)}", 'error')
+            self.text_input.delete(1.0, tk.END)
+            self.update_status(f"Loading PDF: {file_path.split('/')[-1]}...", 'info')
+            threading.Thread(target=self.extract_pdf, args=(file_path,), daemon=True).start()
+    
+    def extract_pdf(self, file_path):
+        """Stream PDF pages into the input area as they are extracted"""
+        try:
+            page_count = 0
+            # One process by default: a process per core would compete with the
+            # UI and the rest of the desktop; PDF_JOBS opts into more
+            for text in iter_pdf_pages(file_path, jobs=int(os.environ.get('PDF_JOBS', 1))):
+                self.root.after(0, lambda text=text: self.text_input.insert(tk.END, text + "\n"))
+                page_count += 1
+            self.root.after(0, lambda: self.update_status(
+                f"Loaded PDF: {file_path.split('/')[-1]} ({page_count} pages)", 'success'))
+        except Exception as e:
+            error_msg = f"Failed to load PDF: {str(e)}"
+            self.root.after(0, lambda: self.update_status(error_msg, 'error'))
 
     def load_file(self):
         """Load text from a file"""
@@ -303,32 +316,15 @@ class TextSummarizerApp:
             except Exception as e:
                 self.update_status(f"Failed to save: {str(e)}", 'error')
     
+    def on_length_change(self):
+        """Refresh an existing summary when the length is changed"""
+        if self.summary_output.get(1.0, tk.END).strip():
+            self.summarize_threaded()
+    
     def summarize_threaded(self):
         """Run summarization in a separate thread to prevent GUI freezing"""
         threading.Thread(target=self.summarize_text, daemon=True).start()
         
-    def extract_topics(self, text):
-        """Extract topics from text based on headings and structure"""
-        topics = []
-        
-        # Split by common heading patterns
-        sections = re.split(r'\n\s*(?:[A-Z][^\n]*|\d+\.\s*[A-Z][^\n]*|Chapter\s+\d+|Section\s+\d+)\s*\n', text)
-        headings = re.findall(r'\n\s*((?:[A-Z][^\n]*|\d+\.\s*[A-Z][^\n]*|Chapter\s+\d+|Section\s+\d+))\s*\n', text)
-        
-        # If no clear headings, split by paragraphs
-        if len(sections) < 3:
-            paragraphs = text.split('\n\n')
-            sections = [p for p in paragraphs if len(p.strip()) > 100]
-            headings = [f"Topic {i+1}" for i in range(len(sections))]
-        
-        # Pair headings with content
-        for i, section in enumerate(sections[1:], 0):  # Skip first empty section
-            if section.strip() and len(section.strip()) > 50:
-                heading = headings[i] if i < len(headings) else f"Topic {i+1}"
-                topics.append((heading.strip(), section.strip()))
-        
-        return topics
-    
     def summarize_text(self):
         """Summarize the input text"""
         # Get input text
@@ -347,29 +343,33 @@ class TextSummarizerApp:
             mode = self.summary_mode.get()
             language = self.language_mode.get() if self.language_mode.get() != "auto" else None
             
-            # Detect and display language
+            # Detect and display language; the detected language is passed on
+            # below so the text is not run through detection again
             detected_lang = detect_language(input_text) if language is None else language
             lang_name = LANGUAGE_MAPPINGS.get(detected_lang, detected_lang)
             self.root.after(0, lambda: self.update_status(f"Processing in {lang_name}...", 'info'))
             
             if mode == "topics":
-                # Topic-based summarization
-                topics = self.extract_topics(input_text)
+                # Topic-based summarization: all sections share one vectorizer
+                topics = summarize_topics(input_text, self.num_sentences.get(), detected_lang)
                 if not topics:
                     summary = "No clear topics found. Using normal summarization.\n\n"
-                    summary += summarize_text(input_text, self.num_sentences.get(), language)
+                    summary += summarize_text(input_text, self.num_sentences.get(), detected_lang)
                 else:
                     summary = f"📚 TOPIC-BASED SUMMARY ({len(topics)} topics found)\n"
                     summary += "=" * 60 + "\n\n"
                     
-                    for i, (heading, content) in enumerate(topics, 1):
-                        topic_summary = summarize_text(content, max(2, self.num_sentences.get() // len(topics)), language)
+                    for i, (heading, topic_summary) in enumerate(topics, 1):
                         summary += f"{i}. {heading}\n"
                         summary += "-" * 40 + "\n"
                         summary += f"{topic_summary}\n\n"
             else:
-                # Normal summarization
-                summary = summarize_text(input_text, self.num_sentences.get(), language)
+                # Normal summarization from the cached ranking
+                try:
+                    document = self.ranking_cache.rank_document(input_text, detected_lang)
+                    summary = document.summary(self.num_sentences.get())
+                except SummarizationError as e:
+                    summary = str(e)
             
             # Update output
             self.root.after(0, lambda: self.update_summary(summary))